@@ -121,7 +121,7 @@ class FilesTab(QWidget):
         ffl.setProperty("cssClass", "field-label")
         fc.addWidget(ffl)
         self.format_combo = QComboBox()
-        self.format_combo.addItems(["txt", "md", "json", "pdf"])
+        self.format_combo.addItems(["txt", "md", "json", "jsonl", "pdf"])
         fc.addWidget(self.format_combo)
         row1.addLayout(fc, 1)
 
@@ -19,13 +19,15 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 
 from gui.widgets import DirectoryPicker, FileTreeWidget
-from gui.workers import ScanWorker, ExportWorker
+from gui.workers import ScanWorker, ExportWorker, WatchWorker
 
 
 class ScanTab(QWidget):
     def __init__(self):
         super().__init__()
         self.scan_result = None
+        self.last_export = None
+        self.watch_worker = None
         self._setup_ui()
 
     def _setup_ui(self):
@@ -64,6 +66,19 @@ class ScanTab(QWidget):
         self.dir_picker = DirectoryPicker("Укажите путь к папке проекта...")
         source_layout.addWidget(self.dir_picker)
 
+        jobs_row = QHBoxLayout()
+        jobs_row.setSpacing(8)
+        jobs_label = QLabel("Потоки чтения")
+        jobs_label.setProperty("cssClass", "field-label")
+        jobs_row.addWidget(jobs_label)
+        self.jobs_combo = QComboBox()
+        self.jobs_combo.addItems(["1", "2", "4", "8", "16"])
+        self.jobs_combo.setCurrentText("4")
+        self.jobs_combo.setToolTip("Сколько файлов читать параллельно (полезно для сетевых дисков)")
+        jobs_row.addWidget(self.jobs_combo)
+        jobs_row.addStretch()
+        source_layout.addLayout(jobs_row)
+
         source_layout.addSpacing(4)
 
         scan_row = QHBoxLayout()
@@ -121,8 +136,10 @@ class ScanTab(QWidget):
         format_label.setProperty("cssClass", "field-label")
         format_col.addWidget(format_label)
         self.format_combo = QComboBox()
-        self.format_combo.addItems(["txt", "md", "json", "pdf"])
-        self.format_combo.setToolTip("TXT — текст, MD — Markdown, JSON — данные, PDF — документ")
+        self.format_combo.addItems(["txt", "md", "json", "jsonl", "pdf"])
+        self.format_combo.setToolTip(
+            "TXT — текст, MD — Markdown, JSON — данные, JSONL — запись на строку, PDF — документ"
+        )
         format_col.addWidget(self.format_combo)
         row1.addLayout(format_col, 1)
 
@@ -146,6 +163,10 @@ class ScanTab(QWidget):
         self.redact_check = QCheckBox("Цензура данных")
         self.redact_check.setToolTip("Заменить пароли, ключи, email на ***REDACTED***")
         options_layout.addWidget(self.redact_check)
+        self.watch_check = QCheckBox("Следить за изменениями")
+        self.watch_check.setToolTip("Обновлять отчёт автоматически при изменении файлов")
+        self.watch_check.toggled.connect(self._on_watch_toggled)
+        options_layout.addWidget(self.watch_check)
         options_layout.addStretch()
         export_layout.addLayout(options_layout)
 
@@ -217,12 +238,14 @@ class ScanTab(QWidget):
             QMessageBox.warning(self, "Ошибка", "Укажите путь к директории")
             return
 
+        self._stop_watch()
+        self.last_export = None
         self.scan_button.setEnabled(False)
         self.progress.show()
         self.status_label.setText("Сканирование...")
         self.log.append(f"▶ {path}")
 
-        self.worker = ScanWorker(path)
+        self.worker = ScanWorker(path, jobs=int(self.jobs_combo.currentText()))
         self.worker.progress.connect(lambda m: self.log.append(f"  {m}"))
         self.worker.finished_signal.connect(self._on_scan_finished)
         self.worker.error.connect(self._on_error)
@@ -277,6 +300,7 @@ class ScanTab(QWidget):
 
         self.export_button.setEnabled(False)
         self.log.append(f"▶ {filename}.{fmt}")
+        self.last_export = (filename, fmt, output_dir, include_tree, redact, patterns)
 
         self.export_worker = ExportWorker(
             self.scan_result, filename, fmt, output_dir, include_tree, redact, patterns
@@ -288,4 +312,36 @@ class ScanTab(QWidget):
     def _on_export_finished(self, path):
         self.export_button.setEnabled(True)
         self.log.append(f"✓ {path}")
-        QMessageBox.information(self, "Готово", f"Отчёт создан:\n{path}")
\ No newline at end of file
+        if self.watch_check.isChecked():
+            self._start_watch()
+        QMessageBox.information(self, "Готово", f"Отчёт создан:\n{path}")
+
+    def _on_watch_toggled(self, checked):
+        if checked:
+            self._start_watch()
+        else:
+            self._stop_watch()
+
+    def _start_watch(self):
+        if self.watch_worker is not None or not self.scan_result or self.last_export is None:
+            return
+
+        self.export_button.setEnabled(False)
+        self.export_button.setToolTip("Отчёт обновляется автоматически")
+
+        self.watch_worker = WatchWorker(self.scan_result, *self.last_export)
+        self.watch_worker.progress.connect(lambda m: self.log.append(f"  {m}"))
+        self.watch_worker.exported.connect(lambda p: self.log.append(f"↻ {p}"))
+        self.watch_worker.error.connect(self._on_error)
+        self.watch_worker.start()
+
+    def _stop_watch(self):
+        if self.watch_worker is None:
+            return
+
+        self.watch_worker.stop()
+        self.watch_worker.wait()
+        self.watch_worker = None
+
+        self.export_button.setEnabled(self.scan_result is not None)
+        self.export_button.setToolTip("Создать отчёт")
\ No newline at end of file
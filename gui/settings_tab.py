@@ -163,6 +163,9 @@ class SettingsTab(QWidget):
             "root_path": "",
             "include_tree": True,
             "export_format": "txt",
+            "exclude": [],
+            "include": [],
+            "use_gitignore": True,
         }
         save_profile(name, settings)
         self.profile_name_input.clear()
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from PySide6.QtWidgets import (
@@ -14,6 +15,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from src.tree_model import get_tree_model, iter_children
+
 
 class DirectoryPicker(QWidget):
     def __init__(self, placeholder="Выберите директорию..."):
@@ -68,59 +71,49 @@ class FileTreeWidget(QTreeWidget):
         self.setAnimated(True)
         self.setIndentation(20)
 
+        self._model = None
+        self.itemExpanded.connect(self._populate)
+
     def load_scan_result(self, scan_result):
         self.clear()
-        nodes = {}
         root_path_str = scan_result.get("root", "")
         root_name = Path(root_path_str).name if root_path_str else "Project"
 
         root_item = QTreeWidgetItem(self, [root_name, "Корень", ""])
+        self._model = get_tree_model(scan_result)
+        self._add_children(root_item, -1)
         root_item.setExpanded(True)
-        nodes["."] = root_item
-
-        if "structure" in scan_result:
-            for item in scan_result["structure"]:
-                path = Path(item["path"])
-
-                try:
-                    parent_path = path.parent
-                    parent_key = str(parent_path) if str(parent_path) != "." else "."
-                except ValueError:
-                    parent_key = "."
-
-                parent_node = nodes.get(parent_key, root_item)
-
-                if item["type"] == "directory":
-                    type_text = "📁  Папка"
-                else:
-                    type_text = path.suffix or "Файл"
-
-                node = QTreeWidgetItem(parent_node, [path.name, type_text, ""])
-
-                if item["type"] == "directory":
-                    nodes[str(path)] = node
-                    node.setExpanded(True)
-
-        if "files" in scan_result:
-            for file_data in scan_result["files"]:
-                path = Path(file_data["path"])
-                size = len(file_data.get("content", "").encode("utf-8"))
-
-                found = self._find_node_by_name(root_item, path.name)
-                if found:
-                    found.setText(2, self._format_size(size))
-
-    def _find_node_by_name(self, parent_item, name):
-        if parent_item.text(0) == name:
-            return parent_item
-        for i in range(parent_item.childCount()):
-            child = parent_item.child(i)
-            if child.text(0) == name:
-                return child
-            found = self._find_node_by_name(child, name)
-            if found:
-                return found
-        return None
+
+        for index in range(root_item.childCount()):
+            item = root_item.child(index)
+            if item.data(0, Qt.ItemDataRole.UserRole) is not None:
+                self._populate(item)
+                item.setExpanded(True)
+
+    def _add_children(self, parent_item, node):
+        model = self._model
+
+        for child in iter_children(model, node):
+            name = model["names"][child]
+            size = model["size"][child]
+
+            if model["is_dir"][child]:
+                type_text = f"📁  Папка ({model['files'][child]})"
+            else:
+                type_text = os.path.splitext(name)[1] or "Файл"
+
+            item = QTreeWidgetItem(parent_item, [name, type_text, self._format_size(size) if size else ""])
+
+            if model["is_dir"][child]:
+                item.setData(0, Qt.ItemDataRole.UserRole, child)
+                if model["end"][child] > child + 1:
+                    item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+
+    def _populate(self, item):
+        node = item.data(0, Qt.ItemDataRole.UserRole)
+
+        if node is not None and self._model is not None and not item.childCount():
+            self._add_children(item, node)
 
     def _format_size(self, size_bytes):
         if size_bytes < 1024:
@@ -1,3 +1,5 @@
+import threading
+
 from PySide6.QtCore import QThread, Signal
 
 
@@ -6,17 +8,22 @@ class ScanWorker(QThread):
     finished_signal = Signal(dict)
     error = Signal(str)
 
-    def __init__(self, path, max_file_size=10):
+    def __init__(self, path, max_file_size=10, jobs=1):
         super().__init__()
         self.path = path
         self.max_file_size = max_file_size
+        self.jobs = jobs
 
     def run(self):
         try:
             from src.scanner import scan_directory
+            from src.session import load_previous_scan
 
             self.progress.emit("Сканирование начато...")
-            result = scan_directory(self.path, self.max_file_size)
+            previous = load_previous_scan(self.path)
+            result = scan_directory(
+                self.path, self.max_file_size, self.jobs, previous, lazy=True
+            )
             if result is None:
                 self.error.emit("Директория не найдена или недоступна")
                 return
@@ -54,4 +61,61 @@ class ExportWorker(QThread):
             save_session(data, report_path=output_file)
             self.finished_signal.emit(str(output_file))
         except Exception as e:
-            self.error.emit(str(e))
\ No newline at end of file
+            self.error.emit(str(e))
+
+
+class WatchWorker(QThread):
+    progress = Signal(str)
+    exported = Signal(str)
+    error = Signal(str)
+
+    def __init__(self, scan_result, filename, fmt, output_dir, include_tree, redact, patterns,
+                 max_file_size=10):
+        super().__init__()
+        self.scan_result = scan_result
+        self.filename = filename
+        self.fmt = fmt
+        self.output_dir = output_dir
+        self.include_tree = include_tree
+        self.redact = redact
+        self.patterns = patterns
+        self.max_file_size = max_file_size
+        self._stop_event = threading.Event()
+        self._redact_cache = {}
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        try:
+            import os
+            from pathlib import Path
+            from src.watcher import watch_scan
+
+            root = Path(self.scan_result["root"])
+            ignore_patterns = []
+            try:
+                prefix = str(Path(self.output_dir).resolve().relative_to(root))
+                ignore_patterns.append(os.path.join("" if prefix == "." else prefix, f"{self.filename}.*"))
+            except ValueError:
+                pass
+
+            self.progress.emit("Наблюдение за изменениями включено")
+            watch_scan(
+                self.scan_result, self._on_update, self.max_file_size,
+                stop_event=self._stop_event, ignore_patterns=ignore_patterns, lazy=True,
+            )
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def _on_update(self, scan_result, changed):
+        from src.exporter import export
+        from src.redactor import redact_scan_result
+
+        data = scan_result
+        if self.redact:
+            data, _ = redact_scan_result(data, self.patterns, cache=self._redact_cache)
+
+        output_file = export(data, self.filename, self.fmt, self.output_dir, self.include_tree)
+        self.progress.emit(f"Изменений: {len(changed)} — отчёт обновлён")
+        self.exported.emit(str(output_file))
\ No newline at end of file
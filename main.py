@@ -1,7 +1,16 @@
+import multiprocessing
 import sys
 from pathlib import Path
 
 from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TimeElapsedColumn,
+)
 
 from src.menu import (
     BACK_VALUE,
@@ -13,6 +22,7 @@ from src.menu import (
     input_file_path,
     input_filename,
     input_profile_name,
+    input_ignore_patterns,
     select_export_format,
     select_convert_format,
     select_output_directory,
@@ -39,6 +49,8 @@ from src.menu import (
 )
 from src.scanner import (
     scan_directory,
+    scan_directories,
+    scan_inventory,
     get_subdirectories,
     build_tree_view,
     collect_text_files,
@@ -56,14 +68,16 @@ from src.session import (
     get_sessions_root,
     set_sessions_root,
     delete_session,
+    load_previous_scan,
 )
-from src.preview import show_preview
+from src.preview import show_estimate, show_preview
 from src.exporter import export
 from src.converter import detect_modification, convert_pdf_to_format
 from src.redactor import redact_scan_result, get_available_patterns
 from src.clipboard import copy_to_clipboard
-from src.config import save_profile, load_profile, list_profiles, delete_profile
+from src.config import save_profile, load_profile, list_profiles, delete_profile, split_patterns
 from src.utils.filename import resolve_filename, generate_unique_filename
+from src.token_counter import estimate_inventory_tokens
 
 console = Console()
 
@@ -111,6 +125,57 @@ def handle_post_export(output_file):
         console.print("[red]✗ Не удалось скопировать[/red]")
 
 
+def scan_selected_directories(directories, profile_settings=None):
+    results = {}
+    total_files = 0
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("Сканирование директорий", total=len(directories))
+
+        for directory, result in scan_directories(
+            directories,
+            filters=profile_settings,
+            limits=profile_settings,
+            budget=profile_settings,
+            lazy=True,
+        ):
+            progress.advance(task)
+
+            if not result:
+                continue
+
+            results[directory] = result
+            total_files += len(result["files"])
+            progress.update(
+                task,
+                description=f"Сканирование директорий — файлов: {total_files}",
+            )
+
+            console.print(build_tree_view(result))
+            show_preview(result)
+
+    return [results[str(d)] for d in directories if str(d) in results]
+
+
+def confirm_full_read(root_path, profile_settings=None):
+    inventory = scan_inventory(root_path, profile_settings, profile_settings)
+
+    if inventory is None:
+        return True
+
+    show_estimate(inventory, estimate_inventory_tokens(inventory))
+    proceed = confirm_action("Выполнить полное чтение файлов?")
+    return not is_back(proceed) and proceed
+
+
 def handle_scan(profile_settings=None):
     state = {
         "mode": None,
@@ -121,6 +186,7 @@ def handle_scan(profile_settings=None):
         "filename": None,
         "export_format": None,
         "output_dir": None,
+        "profile": profile_settings,
     }
 
     if profile_settings:
@@ -151,25 +217,43 @@ def handle_scan(profile_settings=None):
 
         elif step == 3:
             scan_results = []
+            previewed = False
+
+            if state["mode"] in ("single", "recursive"):
+                if not confirm_full_read(state["root_path"], state["profile"]):
+                    step = 2
+                    continue
 
             if state["mode"] == "single":
-                result = scan_directory(state["root_path"])
+                result = scan_directory(
+                    state["root_path"],
+                    previous=load_previous_scan(state["root_path"]),
+                    filters=state["profile"],
+                    limits=state["profile"],
+                    budget=state["profile"],
+                    lazy=True,
+                )
                 if result:
                     scan_results.append(result)
 
             elif state["mode"] == "multi":
-                subdirs = get_subdirectories(state["root_path"])
+                subdirs = get_subdirectories(state["root_path"], state["profile"])
                 selected = select_multiple_directories(subdirs)
                 if is_back(selected):
                     step = 2
                     continue
-                for directory in selected:
-                    result = scan_directory(directory)
-                    if result:
-                        scan_results.append(result)
+                scan_results = scan_selected_directories(selected, state["profile"])
+                previewed = True
 
             elif state["mode"] == "recursive":
-                result = scan_directory(state["root_path"])
+                result = scan_directory(
+                    state["root_path"],
+                    previous=load_previous_scan(state["root_path"]),
+                    filters=state["profile"],
+                    limits=state["profile"],
+                    budget=state["profile"],
+                    lazy=True,
+                )
                 if result:
                     scan_results.append(result)
 
@@ -180,10 +264,11 @@ def handle_scan(profile_settings=None):
 
             state["scan_results"] = scan_results
 
-            for result in scan_results:
-                tree = build_tree_view(result)
-                console.print(tree)
-                show_preview(result)
+            if not previewed:
+                for result in scan_results:
+                    tree = build_tree_view(result)
+                    console.print(tree)
+                    show_preview(result)
 
             step = 4
 
@@ -380,7 +465,8 @@ def handle_convert():
                         continue
 
                     if action == "rescan":
-                        scan_result = scan_directory(session_data["scan_data"]["root"])
+                        scan_root = session_data["scan_data"]["root"]
+                        scan_result = scan_directory(scan_root, previous=load_previous_scan(scan_root))
                         if scan_result is None:
                             console.print("[bold red]Ошибка пересканирования[/bold red]")
                             step = 2
@@ -897,6 +983,9 @@ def handle_settings():
                 "include_tree": True,
                 "export_format": "txt",
                 "output_dir": None,
+                "exclude": [],
+                "include": [],
+                "use_gitignore": True,
             }
 
             root = input_directory_path()
@@ -920,6 +1009,18 @@ def handle_settings():
             if not is_back(out_dir):
                 settings["output_dir"] = out_dir
 
+            exclude = input_ignore_patterns("Исключить (шаблоны .gitignore через запятую, Enter — пропустить):")
+            if not is_back(exclude):
+                settings["exclude"] = split_patterns(exclude)
+
+            include = input_ignore_patterns("Включать только (шаблоны через запятую, Enter — все файлы):")
+            if not is_back(include):
+                settings["include"] = split_patterns(include)
+
+            use_gitignore = confirm_action("Учитывать .gitignore и .ignore?")
+            if not is_back(use_gitignore):
+                settings["use_gitignore"] = use_gitignore
+
             path = save_profile(name, settings)
             console.print(f"[bold green]✓ Профиль сохранён: {path}[/bold green]")
 
@@ -1011,6 +1112,8 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
     if "--gui" in sys.argv:
         from gui import run_gui
         run_gui()
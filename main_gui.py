@@ -1,6 +1,8 @@
+import multiprocessing
 import sys
 from gui import run_gui
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     sys.argv.append("--gui")
     run_gui()
\ No newline at end of file
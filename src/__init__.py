@@ -23,8 +23,14 @@ from src.menu import (
     select_session_from_list,
     select_sessions_directory_mode,
 )
-from src.scanner import scan_directory, get_subdirectories, build_tree_view
-from src.exporter import export
+from src.scanner import (
+    scan_directory,
+    iter_scan,
+    scan_inventory,
+    get_subdirectories,
+    build_tree_view,
+)
+from src.exporter import export, export_stream, export_inventory
 from src.converter import convert_from_session, detect_modification
 from src.session import (
     save_session,
@@ -36,9 +42,10 @@ from src.session import (
     set_sessions_root,
     delete_session,
 )
-from src.redactor import redact_scan_result, get_available_patterns
+from src.redactor import redact_scan_result, redact_records, get_available_patterns
 from src.clipboard import copy_to_clipboard
 from src.config import save_profile, load_profile, list_profiles, delete_profile
-from src.chunker import export_chunked, split_scan_result
+from src.chunker import export_chunked, export_chunked_stream, split_scan_result
+from src.tree_model import build_tree_model, get_tree_model
 from src.token_counter import count_tokens, get_scan_tokens, show_token_info
-from src.preview import show_preview
\ No newline at end of file
+from src.preview import show_preview, show_inventory
\ No newline at end of file
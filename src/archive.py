@@ -0,0 +1,232 @@
+import gzip
+import lzma
+import os
+import tarfile
+import zipfile
+import zlib
+
+from src.utils.encoding import decode_text
+from src.utils.file_filter import (
+    SNIFF_SIZE,
+    is_binary_content,
+    is_binary_extension,
+    is_generated_content,
+    is_generated_file,
+)
+from src.walker import join_relative
+
+ARCHIVE_SUFFIXES = (
+    ".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz", ".gz",
+)
+
+TAR_SUFFIXES = (
+    ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz",
+)
+
+ARCHIVE_ERRORS = (
+    OSError,
+    EOFError,
+    RuntimeError,
+    NotImplementedError,
+    zipfile.BadZipFile,
+    tarfile.TarError,
+    zlib.error,
+    lzma.LZMAError,
+)
+
+
+def is_archive(filepath):
+    return os.path.basename(filepath).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def scan_archive(filepath, relative, max_file_size_mb=10, limits=None):
+    limits = limits or {}
+    max_size = max_file_size_mb * 1024 * 1024
+    skip_generated = limits.get("skip_generated", True)
+
+    def wanted(name, size):
+        return not (
+            is_binary_extension(name)
+            or (skip_generated and is_generated_file(name))
+            or size > max_size
+        )
+
+    sources = {}
+
+    try:
+        tree = _member_tree(_iter_members(filepath, wanted, sources))
+    except ARCHIVE_ERRORS:
+        return None
+
+    if tree is None:
+        return None
+
+    walk_records = []
+    members = []
+    stack = [_sorted_members(tree, "")]
+
+    while stack:
+        item = next(stack[-1], None)
+
+        if item is None:
+            stack.pop()
+            continue
+
+        name, member, node = item
+        path = join_relative(relative, member)
+
+        if isinstance(node, dict):
+            walk_records.append(("structure", {"path": path, "type": "directory"}))
+            stack.append(_sorted_members(node, member))
+            continue
+
+        walk_records.append(("structure", {"path": path, "type": "file"}))
+
+        if is_binary_extension(name):
+            walk_records.append(("skipped", {"path": path, "reason": "Binary file"}))
+        elif skip_generated and is_generated_file(name):
+            walk_records.append(("skipped", {"path": path, "reason": "Generated file"}))
+        elif node > max_size:
+            walk_records.append(("skipped", {
+                "path": path,
+                "reason": f"File too large (>{max_file_size_mb}MB)",
+            }))
+        else:
+            members.append(member)
+
+    records = _iter_archive_records(filepath, relative, members, sources, skip_generated)
+    return walk_records, records
+
+
+def _iter_archive_records(filepath, relative, members, sources, skip_generated):
+    try:
+        for name, data in _iter_contents(filepath, members, sources):
+            path = join_relative(relative, name)
+
+            if is_binary_content(data[:SNIFF_SIZE]):
+                yield "skipped", {"path": path, "reason": "Binary content"}
+                continue
+
+            content, encoding = decode_text(data)
+
+            if skip_generated and is_generated_content(content[:SNIFF_SIZE], name):
+                yield "skipped", {"path": path, "reason": "Generated content"}
+            else:
+                yield "files", {"path": path, "encoding": encoding, "content": content}
+    except ARCHIVE_ERRORS:
+        yield "errors", {"path": relative, "reason": "Failed to read archive"}
+
+
+def _member_tree(members):
+    tree = {}
+
+    for name, size in members:
+        parts = name.split(os.sep)
+        node = tree
+
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+            if not isinstance(node, dict):
+                return None
+
+        if size is None:
+            if not isinstance(node.setdefault(parts[-1], {}), dict):
+                return None
+        elif isinstance(node.get(parts[-1]), dict):
+            return None
+        else:
+            node[parts[-1]] = size
+
+    return tree
+
+
+def _archive_kind(filepath):
+    lowered = filepath.lower()
+
+    if lowered.endswith(".zip"):
+        return "zip"
+    if lowered.endswith(".tar"):
+        return "tar"
+    if lowered.endswith(TAR_SUFFIXES):
+        return "tar-stream"
+    return "gzip"
+
+
+def _iter_members(filepath, wanted, sources):
+    kind = _archive_kind(filepath)
+
+    if kind == "zip":
+        with zipfile.ZipFile(filepath) as archive:
+            for info in archive.infolist():
+                name = _member_name(info.filename)
+                if name is None:
+                    continue
+                if info.is_dir():
+                    yield name, None
+                else:
+                    sources[name] = info
+                    yield name, info.file_size
+        return
+
+    if kind == "gzip":
+        with open(filepath, "rb") as handle:
+            handle.seek(-4, os.SEEK_END)
+            yield _gzip_member(filepath), int.from_bytes(handle.read(4), "little")
+        return
+
+    with tarfile.open(filepath, "r:*" if kind == "tar" else "r|*") as archive:
+        for member in archive:
+            name = _member_name(member.name)
+            if name is None:
+                continue
+            if member.isdir():
+                yield name, None
+            elif member.isfile():
+                if kind == "tar":
+                    sources[name] = member
+                elif wanted(name, member.size):
+                    sources[name] = archive.extractfile(member).read()
+                else:
+                    sources.pop(name, None)
+                yield name, member.size
+
+
+def _iter_contents(filepath, members, sources):
+    kind = _archive_kind(filepath)
+
+    if kind == "zip":
+        with zipfile.ZipFile(filepath) as archive:
+            for name in members:
+                yield name, archive.read(sources[name])
+
+    elif kind == "tar":
+        with tarfile.open(filepath, "r:*") as archive:
+            for name in members:
+                yield name, archive.extractfile(sources[name]).read()
+
+    elif kind == "tar-stream":
+        for name in members:
+            yield name, sources.pop(name)
+
+    else:
+        with gzip.open(filepath, "rb") as handle:
+            for name in members:
+                yield name, handle.read()
+
+
+def _gzip_member(filepath):
+    return os.path.basename(filepath)[:-3] or "data"
+
+
+def _sorted_members(node, relative):
+    names = sorted(node, key=lambda name: (not isinstance(node[name], dict), name.lower()))
+    return ((name, join_relative(relative, name), node[name]) for name in names)
+
+
+def _member_name(name):
+    parts = [part for part in name.replace("\\", "/").split("/") if part not in ("", ".")]
+
+    if not parts or ".." in parts:
+        return None
+
+    return os.sep.join(parts)
@@ -1,71 +1,132 @@
+import os
+from concurrent.futures import Future
 from pathlib import Path
 
-from src.exporter import export
+from src.exporter import export, export_pdf, line_writer, open_pdf_pool, open_sink
+from src.lazy import content_size
+from src.scanner import iter_records
+from src.tree_model import build_tree_model
 
 
 def split_scan_result(scan_result, max_size_mb):
+    return [
+        chunk
+        for chunk in iter_chunks(iter_records(scan_result), scan_result["root"], max_size_mb)
+        if chunk["files"]
+    ]
+
+
+def iter_chunks(records, root, max_size_mb):
     max_size_bytes = max_size_mb * 1024 * 1024
-    chunks = []
-    current_chunk = {
-        "root": scan_result["root"],
-        "structure": scan_result["structure"],
-        "files": [],
-        "skipped": scan_result["skipped"],
-        "errors": scan_result["errors"],
-    }
+    structure = []
+    shared = {}
+    current_chunk = _new_chunk(root, structure)
     current_size = 0
+    emitted = False
 
-    for file_data in scan_result["files"]:
-        file_size = len(file_data["content"].encode("utf-8"))
+    for key, record in records:
+        if key == "structure":
+            structure.append(record)
+            continue
+
+        if key in ("skipped", "errors"):
+            current_chunk[key].append(record)
+            continue
+
+        if key != "files":
+            continue
+
+        file_size = content_size(record)
 
         if current_size + file_size > max_size_bytes and current_chunk["files"]:
-            chunks.append(current_chunk)
-            current_chunk = {
-                "root": scan_result["root"],
-                "structure": scan_result["structure"],
-                "files": [],
-                "skipped": [],
-                "errors": [],
-            }
+            yield _with_tree(current_chunk, shared)
+            emitted = True
+            current_chunk = _new_chunk(root, structure)
             current_size = 0
 
-        current_chunk["files"].append(file_data)
+        current_chunk["files"].append(record)
         current_size += file_size
 
-    if current_chunk["files"]:
-        chunks.append(current_chunk)
+    if current_chunk["files"] or not emitted:
+        yield _with_tree(current_chunk, shared)
 
-    return chunks
 
+def _new_chunk(root, structure):
+    return {
+        "root": str(root),
+        "structure": structure,
+        "files": [],
+        "skipped": [],
+        "errors": [],
+    }
 
-def export_chunked(scan_result, filename, fmt, output_dir=None, include_tree=True, max_size_mb=5):
-    chunks = split_scan_result(scan_result, max_size_mb)
 
-    if len(chunks) <= 1:
-        output_file = export(scan_result, filename, fmt, output_dir, include_tree)
-        return [output_file]
+def _with_tree(chunk, shared):
+    if "tree" not in shared:
+        shared["tree"] = build_tree_model(chunk["structure"])
+    chunk["tree"] = shared["tree"]
+    return chunk
 
-    output_files = []
 
-    for i, chunk in enumerate(chunks, 1):
-        chunk_name = f"{filename}_part{i}"
-        output_file = export(chunk, chunk_name, fmt, output_dir, include_tree)
-        output_files.append(output_file)
+def export_chunked(scan_result, filename, fmt, output_dir=None, include_tree=True, max_size_mb=5,
+                   compact=False, workers=None):
+    return export_chunked_stream(
+        iter_records(scan_result), scan_result["root"], filename, fmt,
+        output_dir, include_tree, max_size_mb, compact, workers,
+    )
 
+
+def export_chunked_stream(records, root, filename, fmt, output_dir=None, include_tree=True, max_size_mb=5,
+                          compact=False, workers=None):
     if output_dir is None:
-        output_dir = scan_result["root"]
+        output_dir = root
+
+    workers = workers or os.cpu_count() or 1
+    executor = open_pdf_pool(workers) if fmt == "pdf" else None
+
+    output_files = []
+    file_counts = []
+    pending = None
+
+    def write(chunk, name):
+        if executor is None:
+            output_files.append(export(chunk, name, fmt, output_dir, include_tree, compact, workers=workers))
+        else:
+            in_flight = [f for f in output_files if isinstance(f, Future) and not f.done()]
+            if len(in_flight) >= workers * 2:
+                in_flight[0].result()
+            output_files.append(executor.submit(export_pdf, chunk, name, output_dir, include_tree, None, 1))
+        file_counts.append(len(chunk["files"]))
+
+    try:
+        for chunk in iter_chunks(records, root, max_size_mb):
+            if pending is not None:
+                write(pending, f"{filename}_part{len(output_files) + 1}")
+            pending = chunk
+
+        if output_files:
+            write(pending, f"{filename}_part{len(output_files) + 1}")
+        else:
+            write(pending, filename)
+
+        output_files = [f.result() if isinstance(f, Future) else f for f in output_files]
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    if len(output_files) == 1:
+        return output_files
 
     index_path = Path(output_dir) / f"{filename}_index.txt"
-    lines = [
-        f"Отчёт разбит на {len(chunks)} частей:",
-        "",
-    ]
 
-    for i, f in enumerate(output_files, 1):
-        file_count = len(chunks[i - 1]["files"])
-        lines.append(f"  Часть {i}: {Path(f).name} ({file_count} файлов)")
+    with open_sink(index_path) as out:
+        line = line_writer(out)
+        line(f"Отчёт разбит на {len(output_files)} частей:")
+        line("")
+
+        for i, f in enumerate(output_files, 1):
+            line(f"  Часть {i}: {Path(f).name} ({file_counts[i - 1]} файлов)")
 
-    index_path.write_text("\n".join(lines), encoding="utf-8")
     output_files.append(index_path)
 
-    return output_files
\ No newline at end of file
+    return output_files
@@ -1,13 +1,18 @@
 import argparse
+import os
 import sys
+from pathlib import Path
 
 from rich.console import Console
 
-from src.scanner import scan_directory
-from src.session import save_session
-from src.exporter import export
+from src.scanner import scan_directory, scan_inventory
+from src.walker import FOLLOW_SYMLINKS
+from src.session import save_session, load_previous_scan
+from src.config import load_profile
+from src.exporter import export, export_inventory
 from src.redactor import redact_scan_result
-from src.preview import show_preview
+from src.token_counter import estimate_inventory_tokens
+from src.preview import show_estimate, show_inventory, show_preview
 
 console = Console()
 
@@ -35,7 +40,7 @@ def parse_args():
     parser.add_argument(
         "--format",
         type=str,
-        choices=["txt", "md", "json", "pdf"],
+        choices=["txt", "md", "json", "jsonl", "pdf"],
         default="txt",
         help="Формат экспорта (по умолчанию: txt)",
     )
@@ -53,6 +58,12 @@ def parse_args():
         help="Не включать дерево структуры в отчёт",
     )
 
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Компактный JSON без отступов и переносов строк",
+    )
+
     parser.add_argument(
         "--redact",
         action="store_true",
@@ -66,6 +77,154 @@ def parse_args():
         help="Максимальный размер файла в МБ (по умолчанию: 10)",
     )
 
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Количество потоков чтения файлов (по умолчанию: 1)",
+    )
+
+    parser.add_argument(
+        "--full-rescan",
+        action="store_true",
+        help="Перечитать все файлы, не используя данные прошлой сессии",
+    )
+
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Исключить пути по шаблону в синтаксисе .gitignore (можно повторять)",
+    )
+
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Включать только файлы по шаблону (можно повторять)",
+    )
+
+    parser.add_argument(
+        "--no-gitignore",
+        action="store_true",
+        help="Не учитывать .gitignore и .ignore",
+    )
+
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=0,
+        help="Максимальная глубина вложенности директорий (0 = без ограничения)",
+    )
+
+    parser.add_argument(
+        "--max-files",
+        type=int,
+        default=0,
+        help="Максимальное количество файлов (0 = без ограничения)",
+    )
+
+    parser.add_argument(
+        "--follow-symlinks",
+        type=str,
+        choices=list(FOLLOW_SYMLINKS),
+        default="always",
+        help="Переходить по символическим ссылкам на директории: always, inside (только внутри корня), never",
+    )
+
+    parser.add_argument(
+        "--sample-head",
+        type=int,
+        default=0,
+        metavar="KB",
+        help="Для файлов больше лимита размера брать первые N КБ вместо пропуска",
+    )
+
+    parser.add_argument(
+        "--sample-tail",
+        type=int,
+        default=0,
+        metavar="KB",
+        help="Для файлов больше лимита размера брать последние N КБ вместо пропуска",
+    )
+
+    parser.add_argument(
+        "--keep-generated",
+        action="store_true",
+        help="Не пропускать lock-файлы, минифицированные и сгенерированные файлы",
+    )
+
+    parser.add_argument(
+        "--keep-duplicates",
+        action="store_true",
+        help="Выводить одинаковые по содержимому файлы полностью, а не ссылкой на первый",
+    )
+
+    parser.add_argument(
+        "--scan-archives",
+        action="store_true",
+        help="Читать содержимое .zip, .tar и .gz архивов без распаковки на диск",
+    )
+
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=0,
+        help="Бюджет токенов: читать файлы по приоритету, пока бюджет не исчерпан (0 = без ограничения)",
+    )
+
+    parser.add_argument(
+        "--max-total-size",
+        type=int,
+        default=0,
+        help="Бюджет общего объёма содержимого в МБ (0 = без ограничения)",
+    )
+
+    parser.add_argument(
+        "--priority",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Шаблон путей, читаемых в первую очередь при бюджете (можно повторять)",
+    )
+
+    parser.add_argument(
+        "--prefer-recent",
+        action="store_true",
+        help="При бюджете читать сначала недавно изменённые файлы, а не самые маленькие",
+    )
+
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        help="Взять правила исключения из сохранённого профиля",
+    )
+
+    parser.add_argument(
+        "--git-ref",
+        type=str,
+        default=None,
+        metavar="REF",
+        help="Сканировать файлы из git-ревизии (ветка, тег, коммит) без checkout",
+    )
+
+    parser.add_argument(
+        "--git-index",
+        action="store_true",
+        help="Сканировать файлы из индекса git (staged), а не рабочую копию",
+    )
+
+    parser.add_argument(
+        "--changed-since",
+        type=str,
+        default=None,
+        metavar="REF",
+        help="Читать только файлы, изменённые относительно git-ревизии (структура — из индекса)",
+    )
+
     parser.add_argument(
         "--split",
         type=int,
@@ -79,6 +238,24 @@ def parse_args():
         help="Тихий режим (без вывода в консоль)",
     )
 
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Следить за изменениями и обновлять отчёт",
+    )
+
+    parser.add_argument(
+        "--inventory",
+        action="store_true",
+        help="Только дерево, размеры и статистика по расширениям (без чтения файлов)",
+    )
+
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help="Быстрая оценка размера и токенов по данным stat и небольшой выборке файлов",
+    )
+
     parser.add_argument(
         "--preview",
         action="store_true",
@@ -94,23 +271,56 @@ def run_cli():
     if not args.silent:
         console.print("[bold cyan]Context Builder — CLI Mode[/bold cyan]\n")
 
-    scan_result = scan_directory(args.path, args.max_file_size)
+    filters = _build_filters(args)
+    limits = {
+        "max_depth": args.max_depth,
+        "max_files": args.max_files,
+        "follow_symlinks": args.follow_symlinks,
+        "sample_head_kb": args.sample_head,
+        "sample_tail_kb": args.sample_tail,
+        "skip_generated": not args.keep_generated,
+        "dedupe": not args.keep_duplicates,
+        "archives": args.scan_archives,
+    }
+    budget = {
+        "max_tokens": args.max_tokens,
+        "max_bytes": args.max_total_size * 1024 * 1024,
+        "priority": args.priority,
+        "order": "recent" if args.prefer_recent else "size",
+    }
+    if args.inventory:
+        _run_inventory(args, filters, limits)
+
+    if args.estimate:
+        _run_estimate(args, filters, limits)
+
+    git_source = args.git_ref is not None or args.git_index or args.changed_since is not None
+
+    if args.changed_since is not None:
+        from src.git_source import scan_git_changes
+        scan_result = scan_git_changes(
+            args.path, args.changed_since, args.max_file_size, filters, limits
+        )
+    elif git_source:
+        from src.git_source import scan_git
+        ref = None if args.git_index else args.git_ref
+        scan_result = scan_git(args.path, ref, args.max_file_size, filters, limits)
+    else:
+        previous = None if args.full_rescan else load_previous_scan(args.path)
+        scan_result = scan_directory(
+            args.path, args.max_file_size, args.jobs, previous, filters, limits=limits,
+            budget=budget,
+        )
 
     if scan_result is None:
         console.print("[bold red]Ошибка сканирования[/bold red]")
         sys.exit(1)
 
-    if args.redact:
-        scan_result, findings = redact_scan_result(scan_result)
-        if not args.silent and findings:
-            console.print("[yellow]⚠ Цензура применена[/yellow]")
-            for item in findings:
-                console.print(f"  [dim]{item['file']}[/dim]")
-                for f in item["findings"]:
-                    console.print(f"    [red]• {f['pattern']}: {f['count']}[/red]")
+    redact_cache = {}
+    report_data = _apply_redaction(scan_result, args, redact_cache)
 
     if args.preview:
-        show_preview(scan_result)
+        show_preview(report_data)
         sys.exit(0)
 
     if args.output is None:
@@ -118,20 +328,162 @@ def run_cli():
         args.output = f"scan_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
 
     include_tree = not args.no_tree
+    _export_report(report_data, args, include_tree)
+
+    if args.watch and git_source:
+        console.print("[yellow]⚠ --watch не поддерживается для --git-ref, --git-index и --changed-since[/yellow]")
+    elif args.watch:
+        _watch_and_export(
+            scan_result, args, include_tree, redact_cache, filters, limits, budget
+        )
+
+    sys.exit(0)
+
+
+def _run_inventory(args, filters, limits):
+    inventory = scan_inventory(args.path, filters, limits)
+
+    if inventory is None:
+        console.print("[bold red]Ошибка сканирования[/bold red]")
+        sys.exit(1)
+
+    if not args.silent:
+        show_inventory(inventory)
+
+    if args.format == "json" and not args.preview:
+        if args.output is None:
+            from datetime import datetime
+            args.output = f"inventory_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
+
+        output_file = export_inventory(inventory, args.output, args.output_dir)
+        if not args.silent:
+            console.print(f"[bold green]✓ Инвентаризация сохранена: {output_file}[/bold green]")
+
+    sys.exit(0)
+
+
+def _run_estimate(args, filters, limits):
+    inventory = scan_inventory(args.path, filters, limits)
+
+    if inventory is None:
+        console.print("[bold red]Ошибка сканирования[/bold red]")
+        sys.exit(1)
+
+    estimate = estimate_inventory_tokens(inventory, args.max_file_size)
+    show_estimate(inventory, estimate)
+    sys.exit(0)
+
+
+def _build_filters(args):
+    filters = {"exclude": [], "include": [], "use_gitignore": True}
+
+    if args.profile:
+        settings = load_profile(args.profile)
+        if settings is None:
+            console.print(f"[bold red]Профиль не найден: {args.profile}[/bold red]")
+            sys.exit(1)
+        filters["exclude"].extend(settings.get("exclude", []))
+        filters["include"].extend(settings.get("include", []))
+        filters["use_gitignore"] = settings.get("use_gitignore", True)
+
+    filters["exclude"].extend(args.exclude)
+    filters["include"].extend(args.include)
+
+    if args.no_gitignore:
+        filters["use_gitignore"] = False
+
+    return filters
+
+
+def _apply_redaction(scan_result, args, cache=None, report_findings=True):
+    if not args.redact:
+        return scan_result
+
+    redacted_result, findings = redact_scan_result(scan_result, cache=cache)
+
+    if report_findings and not args.silent and findings:
+        console.print("[yellow]⚠ Цензура применена[/yellow]")
+        for item in findings:
+            console.print(f"  [dim]{item['file']}[/dim]")
+            for f in item["findings"]:
+                console.print(f"    [red]• {f['pattern']}: {f['count']}[/red]")
+
+    return redacted_result
+
+
+def _export_report(report_data, args, include_tree, save=True, quiet=False):
     output_dir = args.output_dir
+    quiet = quiet or args.silent
 
     if args.split > 0:
         from src.chunker import export_chunked
         files = export_chunked(
-            scan_result, args.output, args.format, output_dir, include_tree, args.split
+            report_data, args.output, args.format, output_dir, include_tree, args.split, args.compact
         )
         for f in files:
-            if not args.silent:
+            if not quiet:
                 console.print(f"[bold green]✓ {f}[/bold green]")
-    else:
-        output_file = export(scan_result, args.output, args.format, output_dir, include_tree)
-        save_session(scan_result, report_path=output_file)
+        return files
+
+    stats = {}
+    output_file = export(report_data, args.output, args.format, output_dir, include_tree, args.compact, stats)
+    if save:
+        save_session(report_data, report_path=output_file)
+    if not quiet:
+        console.print(f"[bold green]✓ Отчёт создан: {output_file}[/bold green]")
+        if stats:
+            console.print(
+                f"[dim]PDF: {stats['pages']} стр. за {stats['seconds']:.2f} с "
+                f"({stats['pages_per_second']:.0f} стр/с)[/dim]"
+            )
+    return [output_file]
+
+
+def _watch_and_export(scan_result, args, include_tree, redact_cache, filters=None, limits=None,
+                      budget=None):
+    import time
+    from src.watcher import watch_scan
+
+    root = Path(scan_result["root"])
+    output_dir = Path(args.output_dir).resolve() if args.output_dir else root
+    ignore_patterns = []
+
+    try:
+        prefix = str(output_dir.relative_to(root))
+        if prefix == ".":
+            prefix = ""
+        for name in (f"{args.output}.*", f"{args.output}_part*", f"{args.output}_index.txt"):
+            ignore_patterns.append(os.path.join(prefix, name))
+    except ValueError:
+        pass
+
+    if not args.silent:
+        console.print("[cyan]👁 Наблюдение за изменениями (Ctrl+C — выход)[/cyan]")
+
+    state = {"report_data": None}
+
+    def on_update(result, changed):
+        started = time.perf_counter()
+        report_data = _apply_redaction(result, args, redact_cache, report_findings=False)
+        state["report_data"] = report_data
+
+        _export_report(report_data, args, include_tree, save=False, quiet=True)
+
         if not args.silent:
-            console.print(f"[bold green]✓ Отчёт создан: {output_file}[/bold green]")
+            elapsed = time.perf_counter() - started
+            console.print(
+                f"[green]↻ Изменений: {len(changed)} — отчёт обновлён за {elapsed:.2f} с[/green]"
+            )
 
-    sys.exit(0)
\ No newline at end of file
+    try:
+        watch_scan(
+            scan_result, on_update, args.max_file_size,
+            ignore_patterns=ignore_patterns,
+            filters=filters,
+            limits=limits,
+            budget=budget,
+        )
+    except KeyboardInterrupt:
+        if state["report_data"] is not None and args.split <= 0:
+            report_path = output_dir / f"{args.output}.{args.format}"
+            save_session(state["report_data"], report_path=report_path)
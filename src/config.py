@@ -51,4 +51,8 @@ def delete_profile(name):
         profile_path.unlink()
         return True
 
-    return False
\ No newline at end of file
+    return False
+
+
+def split_patterns(text):
+    return [pattern.strip() for pattern in text.split(",") if pattern.strip()]
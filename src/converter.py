@@ -2,6 +2,7 @@ from pathlib import Path
 
 from rich.console import Console
 
+from src.exporter import open_sink
 from src.session import load_session, calculate_file_hash
 
 console = Console()
@@ -87,39 +88,36 @@ def convert_pdf_to_format(pdf_path, filename, target_format, output_dir=None):
     if text is None:
         return None
 
-    output_path = Path(output_dir) / f"{filename}.{target_format}"
-
-    if target_format == "txt":
-        output_path.write_text(text, encoding="utf-8")
-
-    elif target_format == "md":
-        md_content = f"# Конвертировано из PDF\n\n"
-        md_content += f"- **Источник:** `{pdf_path.name}`\n"
-        md_content += f"- **Дата:** {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        md_content += "---\n\n"
-        md_content += "```\n"
-        md_content += text
-        md_content += "\n```\n"
-        output_path.write_text(md_content, encoding="utf-8")
-
-    elif target_format == "json":
-        import json
-
-        json_data = {
-            "metadata": {
-                "source": str(pdf_path),
-                "converted_at": __import__('datetime').datetime.now().isoformat(),
-                "format": "pdf_to_json",
-            },
-            "content": text,
-        }
-        output_path.write_text(
-            json.dumps(json_data, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
-
-    else:
+    if target_format not in ("txt", "md", "json"):
         console.print(f"[bold red]Неподдерживаемый формат: {target_format}[/bold red]")
         return None
 
+    output_path = Path(output_dir) / f"{filename}.{target_format}"
+
+    with open_sink(output_path) as out:
+        if target_format == "txt":
+            out.write(text)
+
+        elif target_format == "md":
+            out.write(f"# Конвертировано из PDF\n\n")
+            out.write(f"- **Источник:** `{pdf_path.name}`\n")
+            out.write(f"- **Дата:** {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            out.write("---\n\n")
+            out.write("```\n")
+            out.write(text)
+            out.write("\n```\n")
+
+        else:
+            import json
+
+            json_data = {
+                "metadata": {
+                    "source": str(pdf_path),
+                    "converted_at": __import__('datetime').datetime.now().isoformat(),
+                    "format": "pdf_to_json",
+                },
+                "content": text,
+            }
+            json.dump(json_data, out, ensure_ascii=False, indent=2)
+
     return output_path
\ No newline at end of file
@@ -1,286 +1,580 @@
+import copy
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 
+from src.lazy import content_size, make_eager
+from src.scanner import collect_scan, iter_records
+from src.tree_model import add_tree_node, get_tree_model, new_tree_model
+
+SINK_BUFFER_SIZE = 1024 * 1024
+
+PDF_LINE_LIMIT = 120
+
+PDF_SECTION_BYTES = 1024 * 1024
+
+_pdf_cache = None
+
 
 def export_txt(scan_result, filename, output_dir=None, include_tree=True):
-    if output_dir is None:
-        output_dir = scan_result["root"]
+    return export_stream(
+        _scan_records(scan_result), scan_result["root"], filename, "txt", output_dir, include_tree
+    )
 
-    output_path = Path(output_dir) / f"{filename}.txt"
-    lines = []
 
-    lines.append("=" * 70)
-    lines.append("  ОТЧЁТ О СТРУКТУРЕ ПРОЕКТА")
-    lines.append(f"  Дата: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append(f"  Корневая директория: {scan_result['root']}")
-    lines.append("=" * 70)
-    lines.append("")
+def _scan_records(scan_result):
+    yield "tree", get_tree_model(scan_result)
 
-    if include_tree:
-        lines.append("-" * 70)
-        lines.append("  ДЕРЕВО СТРУКТУРЫ")
-        lines.append("-" * 70)
-        lines.append("")
+    for key in ("skipped", "errors", "files"):
+        for record in scan_result[key]:
+            yield key, record
 
-        for item in scan_result["structure"]:
-            depth = item["path"].count("\\") + item["path"].count("/")
-            indent = "    " * depth
 
-            if item["type"] == "directory":
-                lines.append(f"{indent}📁 {Path(item['path']).name}/")
-            else:
-                lines.append(f"{indent}📄 {Path(item['path']).name}")
+def _write_txt(out, records, root, include_tree):
+    line = line_writer(out)
+    tree = new_tree_model()
+    skipped = []
+    errors = []
 
-        lines.append("")
+    line("=" * 70)
+    line("  ОТЧЁТ О СТРУКТУРЕ ПРОЕКТА")
+    line(f"  Дата: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    line(f"  Корневая директория: {root}")
+    line("=" * 70)
+    line("")
 
-    lines.append("-" * 70)
-    lines.append("  СОДЕРЖИМОЕ ФАЙЛОВ")
-    lines.append("-" * 70)
+    if include_tree:
+        line("-" * 70)
+        line("  ДЕРЕВО СТРУКТУРЫ")
+        line("-" * 70)
+        line("")
+
+    contents_started = False
+
+    for key, record in records:
+        if key in ("tree", "structure"):
+            if include_tree:
+                _write_tree_lines(line, tree, key, record, "    ")
+
+        elif key == "files":
+            if not contents_started:
+                _write_txt_contents_header(line, include_tree)
+                contents_started = True
+
+            line("")
+            line("=" * 70)
+            line(f"  Файл: {record['path']}")
+            line(f"  Кодировка: {record['encoding']}")
+            line("=" * 70)
+            line("")
+            line(record["content"])
+            line("")
+
+        elif key == "skipped":
+            skipped.append(record)
+
+        elif key == "errors":
+            errors.append(record)
+
+    if not contents_started:
+        _write_txt_contents_header(line, include_tree)
+
+    if skipped:
+        line("-" * 70)
+        line("  ПРОПУЩЕННЫЕ ФАЙЛЫ")
+        line("-" * 70)
+        line("")
+        for item in skipped:
+            line(f"  ⚠ {item['path']} — {item['reason']}")
+        line("")
+
+    if errors:
+        line("-" * 70)
+        line("  ОШИБКИ")
+        line("-" * 70)
+        line("")
+        for item in errors:
+            line(f"  ✗ {item['path']} — {item['reason']}")
+        line("")
+
+    line("=" * 70)
+    line("  Конец отчёта")
+    line("=" * 70)
+
+
+def _write_tree_lines(line, tree, key, record, step):
+    if key == "tree":
+        tree, start = record, 0
+    else:
+        start = len(tree["paths"])
+        add_tree_node(tree, record["path"], record["type"] == "directory")
 
-    for file_data in scan_result["files"]:
-        lines.append("")
-        lines.append("=" * 70)
-        lines.append(f"  Файл: {file_data['path']}")
-        lines.append(f"  Кодировка: {file_data['encoding']}")
-        lines.append("=" * 70)
-        lines.append("")
-        lines.append(file_data["content"])
-        lines.append("")
-
-    if scan_result["skipped"]:
-        lines.append("-" * 70)
-        lines.append("  ПРОПУЩЕННЫЕ ФАЙЛЫ")
-        lines.append("-" * 70)
-        lines.append("")
-        for item in scan_result["skipped"]:
-            lines.append(f"  ⚠ {item['path']} — {item['reason']}")
-        lines.append("")
-
-    if scan_result["errors"]:
-        lines.append("-" * 70)
-        lines.append("  ОШИБКИ")
-        lines.append("-" * 70)
-        lines.append("")
-        for item in scan_result["errors"]:
-            lines.append(f"  ✗ {item['path']} — {item['reason']}")
-        lines.append("")
-
-    lines.append("=" * 70)
-    lines.append("  Конец отчёта")
-    lines.append("=" * 70)
-
-    content = "\n".join(lines)
-    output_path.write_text(content, encoding="utf-8")
+    names = tree["names"]
+    depth = tree["depth"]
+    is_dir = tree["is_dir"]
 
-    return output_path
+    for node in range(start, len(names)):
+        if is_dir[node]:
+            line(f"{step * depth[node]}📁 {names[node]}/")
+        else:
+            line(f"{step * depth[node]}📄 {names[node]}")
+
+
+def _write_txt_contents_header(line, include_tree):
+    if include_tree:
+        line("")
+
+    line("-" * 70)
+    line("  СОДЕРЖИМОЕ ФАЙЛОВ")
+    line("-" * 70)
 
 
 def export_md(scan_result, filename, output_dir=None, include_tree=True):
-    if output_dir is None:
-        output_dir = scan_result["root"]
+    return export_stream(
+        _scan_records(scan_result), scan_result["root"], filename, "md", output_dir, include_tree
+    )
 
-    output_path = Path(output_dir) / f"{filename}.md"
-    lines = []
 
-    lines.append("# Отчёт о структуре проекта")
-    lines.append("")
-    lines.append(f"- **Дата:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append(f"- **Корневая директория:** `{scan_result['root']}`")
-    lines.append("")
+def _write_md(out, records, root, include_tree):
+    line = line_writer(out)
+    tree = new_tree_model()
+    skipped = []
+    errors = []
 
+    line("# Отчёт о структуре проекта")
+    line("")
+    line(f"- **Дата:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    line(f"- **Корневая директория:** `{root}`")
+    line("")
+
+    if include_tree:
+        line("## Дерево структуры")
+        line("")
+        line("```")
+
+    contents_started = False
+
+    for key, record in records:
+        if key in ("tree", "structure"):
+            if include_tree:
+                _write_tree_lines(line, tree, key, record, "  ")
+
+        elif key == "files":
+            if not contents_started:
+                _write_md_contents_header(line, include_tree)
+                contents_started = True
+
+            extension = Path(record["path"]).suffix.lstrip(".")
+            line(f"### `{record['path']}`")
+            line("")
+            line(f"```{extension}")
+            line(record["content"])
+            line("```")
+            line("")
+
+        elif key == "skipped":
+            skipped.append(record)
+
+        elif key == "errors":
+            errors.append(record)
+
+    if not contents_started:
+        _write_md_contents_header(line, include_tree)
+
+    if skipped:
+        line("## Пропущенные файлы")
+        line("")
+        for item in skipped:
+            line(f"- ⚠ `{item['path']}` — {item['reason']}")
+        line("")
+
+    if errors:
+        line("## Ошибки")
+        line("")
+        for item in errors:
+            line(f"- ✗ `{item['path']}` — {item['reason']}")
+        line("")
+
+
+def _write_md_contents_header(line, include_tree):
     if include_tree:
-        lines.append("## Дерево структуры")
-        lines.append("")
-        lines.append("```")
+        line("```")
+        line("")
 
-        for item in scan_result["structure"]:
-            depth = item["path"].count("\\") + item["path"].count("/")
-            indent = "  " * depth
+    line("## Содержимое файлов")
+    line("")
 
-            if item["type"] == "directory":
-                lines.append(f"{indent}📁 {Path(item['path']).name}/")
-            else:
-                lines.append(f"{indent}📄 {Path(item['path']).name}")
 
-        lines.append("```")
-        lines.append("")
+def export_json(scan_result, filename, output_dir=None, include_tree=True, compact=False):
+    return export_stream(
+        iter_records(scan_result), scan_result["root"], filename, "json",
+        output_dir, include_tree, compact,
+    )
 
-    lines.append("## Содержимое файлов")
-    lines.append("")
 
-    for file_data in scan_result["files"]:
-        extension = Path(file_data["path"]).suffix.lstrip(".")
-        lines.append(f"### `{file_data['path']}`")
-        lines.append("")
-        lines.append(f"```{extension}")
-        lines.append(file_data["content"])
-        lines.append("```")
-        lines.append("")
-
-    if scan_result["skipped"]:
-        lines.append("## Пропущенные файлы")
-        lines.append("")
-        for item in scan_result["skipped"]:
-            lines.append(f"- ⚠ `{item['path']}` — {item['reason']}")
-        lines.append("")
-
-    if scan_result["errors"]:
-        lines.append("## Ошибки")
-        lines.append("")
-        for item in scan_result["errors"]:
-            lines.append(f"- ✗ `{item['path']}` — {item['reason']}")
-        lines.append("")
-
-    content = "\n".join(lines)
-    output_path.write_text(content, encoding="utf-8")
+def _write_json(out, records, root, include_tree, compact=False):
+    structure = []
+    skipped = []
+    errors = []
+    total_files = 0
+
+    if compact:
+        dump = partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+        indent = ""
+    else:
+        dump = partial(json.dumps, ensure_ascii=False, indent=2)
+        indent = "\n    "
+
+    out.write('{"files":[' if compact else '{\n  "files": [')
+
+    for key, record in records:
+        if key == "files":
+            if total_files:
+                out.write(",")
+            out.write(indent + dump(make_eager(record)).replace("\n", indent))
+            total_files += 1
+        elif key == "structure":
+            if include_tree:
+                structure.append(record)
+        elif key == "skipped":
+            skipped.append(record)
+        elif key == "errors":
+            errors.append(record)
+
+    out.write("]" if compact or not total_files else "\n  ]")
+
+    sections = {"skipped": skipped, "errors": errors}
+    if include_tree:
+        sections["structure"] = structure
+    sections["metadata"] = {
+        "created_at": datetime.now().isoformat(),
+        "root": str(root),
+        "total_files": total_files,
+        "total_skipped": len(skipped),
+        "total_errors": len(errors),
+        "include_tree": include_tree,
+    }
+
+    for key, value in sections.items():
+        if compact:
+            out.write(f",{dump(key)}:{dump(value)}")
+        else:
+            out.write(f",\n  {dump(key)}: " + dump(value).replace("\n", "\n  "))
+
+    out.write("}" if compact else "\n}")
+
+
+def export_jsonl(scan_result, filename, output_dir=None, include_tree=True):
+    return export_stream(
+        iter_records(scan_result), scan_result["root"], filename, "jsonl", output_dir, include_tree
+    )
 
-    return output_path
 
+def _write_jsonl(out, records, root, include_tree):
+    dump = partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+    kinds = {"files": "file", "skipped": "skipped", "errors": "error", "structure": "structure"}
 
-def export_json(scan_result, filename, output_dir=None, include_tree=True):
-    import json
+    out.write(dump({
+        "kind": "metadata",
+        "created_at": datetime.now().isoformat(),
+        "root": str(root),
+        "include_tree": include_tree,
+    }))
+    out.write("\n")
 
+    for key, record in records:
+        if key not in kinds or (key == "structure" and not include_tree):
+            continue
+        if key == "files":
+            record = make_eager(record)
+        out.write(dump({"kind": kinds[key], **record}))
+        out.write("\n")
+
+
+def export_inventory(inventory, filename, output_dir=None):
     if output_dir is None:
-        output_dir = scan_result["root"]
+        output_dir = inventory["root"]
 
     output_path = Path(output_dir) / f"{filename}.json"
 
     export_data = {
         "metadata": {
             "created_at": datetime.now().isoformat(),
-            "root": scan_result["root"],
-            "total_files": len(scan_result["files"]),
-            "total_skipped": len(scan_result["skipped"]),
-            "total_errors": len(scan_result["errors"]),
-            "include_tree": include_tree,
+            "root": inventory["root"],
         },
-        "files": scan_result["files"],
-        "skipped": scan_result["skipped"],
-        "errors": scan_result["errors"],
+        "stats": inventory["stats"],
+        "structure": inventory["structure"],
+        "skipped": inventory["skipped"],
+        "errors": inventory["errors"],
     }
 
-    if include_tree:
-        export_data["structure"] = scan_result["structure"]
-
-    output_path.write_text(
-        json.dumps(export_data, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    with open_sink(output_path) as out:
+        json.dump(export_data, out, ensure_ascii=False, indent=2)
 
     return output_path
 
 
-def export_pdf(scan_result, filename, output_dir=None, include_tree=True):
-    from fpdf import FPDF
+def export_pdf(scan_result, filename, output_dir=None, include_tree=True, stats=None, workers=None):
+    started = time.perf_counter()
 
     if output_dir is None:
         output_dir = scan_result["root"]
 
     output_path = Path(output_dir) / f"{filename}.pdf"
 
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
+    sections = _pdf_sections(scan_result, include_tree)
+    executor = None
 
-    font_dir = Path(__file__).parent / "fonts"
-    regular_font = font_dir / "DejaVuSans.ttf"
-    bold_font = font_dir / "DejaVuSans-Bold.ttf"
-    mono_font = font_dir / "DejaVuSansMono.ttf"
+    if len(sections) > 1 and _pymupdf() is not None:
+        executor = open_pdf_pool(min(len(sections), workers or os.cpu_count() or 1))
 
-    if regular_font.exists() and bold_font.exists() and mono_font.exists():
-        pdf.add_font("DejaVu", "", str(regular_font), uni=True)
-        pdf.add_font("DejaVu", "B", str(bold_font), uni=True)
-        pdf.add_font("DejaVuMono", "", str(mono_font), uni=True)
-        font_regular = "DejaVu"
-        font_mono = "DejaVuMono"
+    if executor is None:
+        data, pages, _ = _render_pdf_section(_pdf_section(scan_result, include_tree))
+        output_path.write_bytes(data)
     else:
-        pdf.add_font("DejaVu", "", "", uni=True)
-        font_regular = "Helvetica"
-        font_mono = "Courier"
+        try:
+            pages = _merge_pdf_sections(executor.map(_render_pdf_section, sections), output_path)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    if stats is not None:
+        elapsed = time.perf_counter() - started
+        stats["pages"] = pages
+        stats["seconds"] = elapsed
+        stats["pages_per_second"] = pages / elapsed if elapsed > 0 else 0.0
+
+    return output_path
+
+
+def open_pdf_pool(workers):
+    if workers <= 1:
+        return None
+
+    try:
+        return ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    except (OSError, NotImplementedError):
+        return None
+
+
+def _pdf_section(scan_result, include_tree, files=None, first=True, last=True):
+    return {
+        "root": scan_result["root"],
+        "created_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "continued": not first,
+        "tree": get_tree_model(scan_result) if include_tree and first else None,
+        "files": scan_result["files"] if files is None else files,
+        "skipped": scan_result["skipped"] if last else [],
+        "errors": scan_result["errors"] if last else [],
+    }
+
+
+def _pdf_sections(scan_result, include_tree):
+    groups = [[]]
+    size = 0
+
+    for file_data in scan_result["files"]:
+        if groups[-1] and size >= PDF_SECTION_BYTES:
+            groups.append([])
+            size = 0
+        groups[-1].append(file_data)
+        size += content_size(file_data)
+
+    return [
+        _pdf_section(scan_result, include_tree, files, i == 0, i == len(groups) - 1)
+        for i, files in enumerate(groups)
+    ]
+
+
+def _render_pdf_section(section):
+    pdf, font_regular, font_mono = _pdf_document()
+    toc = []
 
     pdf.add_page()
 
-    pdf.set_font(font_regular, "B", 18)
-    pdf.cell(0, 12, "Отчёт о структуре проекта", new_x="LMARGIN", new_y="NEXT", align="C")
-    pdf.ln(4)
+    if not section["continued"]:
+        pdf.set_font(font_regular, "B", 18)
+        pdf.cell(0, 12, "Отчёт о структуре проекта", new_x="LMARGIN", new_y="NEXT", align="C")
+        pdf.ln(4)
+
+        pdf.set_font(font_regular, "", 10)
+        pdf.cell(0, 7, f"Дата: {section['created_at']}", new_x="LMARGIN", new_y="NEXT")
+        pdf.cell(0, 7, f"Директория: {section['root']}", new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(6)
 
-    pdf.set_font(font_regular, "", 10)
-    pdf.cell(0, 7, f"Дата: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", new_x="LMARGIN", new_y="NEXT")
-    pdf.cell(0, 7, f"Директория: {scan_result['root']}", new_x="LMARGIN", new_y="NEXT")
-    pdf.ln(6)
+    tree = section["tree"]
 
-    if include_tree and scan_result["structure"]:
+    if tree and tree["paths"]:
+        _pdf_heading(pdf, toc, "Дерево структуры")
         pdf.set_font(font_regular, "B", 14)
         pdf.cell(0, 10, "Дерево структуры", new_x="LMARGIN", new_y="NEXT")
         pdf.ln(2)
 
         pdf.set_font(font_mono, "", 8)
 
-        for item in scan_result["structure"]:
-            depth = item["path"].count("\\") + item["path"].count("/")
-            indent = "    " * depth
-            name = Path(item["path"]).name
+        lines = [
+            f"{'    ' * depth}[D] {name}/" if is_dir else f"{'    ' * depth}[F] {name}"
+            for name, is_dir, depth in zip(tree["names"], tree["is_dir"], tree["depth"])
+        ]
 
-            if item["type"] == "directory":
-                line = f"{indent}[D] {name}/"
-            else:
-                line = f"{indent}[F] {name}"
-
-            pdf.cell(0, 5, line, new_x="LMARGIN", new_y="NEXT")
+        _pdf_lines(pdf, lines, 5)
 
         pdf.ln(6)
 
-    if scan_result["files"]:
+    if section["files"] and not section["continued"]:
+        _pdf_heading(pdf, toc, "Содержимое файлов")
         pdf.set_font(font_regular, "B", 14)
         pdf.cell(0, 10, "Содержимое файлов", new_x="LMARGIN", new_y="NEXT")
         pdf.ln(2)
 
-        for file_data in scan_result["files"]:
-            pdf.set_font(font_regular, "B", 11)
-            pdf.set_fill_color(230, 230, 230)
-            pdf.cell(0, 8, f"  {file_data['path']}", new_x="LMARGIN", new_y="NEXT", fill=True)
-            pdf.ln(2)
+    for file_data in section["files"]:
+        _pdf_heading(pdf, toc, file_data["path"], 1, 8)
+        pdf.set_font(font_regular, "B", 11)
+        pdf.set_fill_color(230, 230, 230)
+        pdf.cell(0, 8, f"  {file_data['path']}", new_x="LMARGIN", new_y="NEXT", fill=True)
+        pdf.ln(2)
 
-            pdf.set_font(font_mono, "", 7)
+        pdf.set_font(font_mono, "", 7)
 
-            content_lines = file_data["content"].split("\n")
-            for line in content_lines:
-                safe_line = line.replace("\r", "").replace("\t", "    ")
-                if len(safe_line) > 120:
-                    safe_line = safe_line[:120] + "..."
-                pdf.cell(0, 4, safe_line, new_x="LMARGIN", new_y="NEXT")
+        content = file_data["content"].replace("\r", "").replace("\t", "    ")
+        _pdf_lines(pdf, content.split("\n"), 4, PDF_LINE_LIMIT)
 
-            pdf.ln(4)
+        pdf.ln(4)
 
-    if scan_result["skipped"]:
+    if section["skipped"]:
+        _pdf_heading(pdf, toc, "Пропущенные файлы")
         pdf.set_font(font_regular, "B", 14)
         pdf.cell(0, 10, "Пропущенные файлы", new_x="LMARGIN", new_y="NEXT")
         pdf.ln(2)
 
         pdf.set_font(font_regular, "", 9)
-        for item in scan_result["skipped"]:
-            pdf.cell(0, 6, f"  ! {item['path']} - {item['reason']}", new_x="LMARGIN", new_y="NEXT")
+        _pdf_lines(pdf, [f"  ! {item['path']} - {item['reason']}" for item in section["skipped"]], 6)
 
         pdf.ln(4)
 
-    if scan_result["errors"]:
+    if section["errors"]:
+        _pdf_heading(pdf, toc, "Ошибки")
         pdf.set_font(font_regular, "B", 14)
         pdf.cell(0, 10, "Ошибки", new_x="LMARGIN", new_y="NEXT")
         pdf.ln(2)
 
         pdf.set_font(font_regular, "", 9)
-        for item in scan_result["errors"]:
-            pdf.cell(0, 6, f"  X {item['path']} - {item['reason']}", new_x="LMARGIN", new_y="NEXT")
+        _pdf_lines(pdf, [f"  X {item['path']} - {item['reason']}" for item in section["errors"]], 6)
 
-    pdf.output(str(output_path))
+    return pdf.output(), pdf.pages_count, toc
 
-    return output_path
 
+def _pdf_heading(pdf, toc, title, level=0, height=10):
+    if pdf.y + height > pdf.page_break_trigger:
+        pdf.add_page()
+
+    pdf.start_section(title, level)
+    toc.append([level + 1, title, pdf.page])
+
+
+def _merge_pdf_sections(parts, output_path):
+    pymupdf = _pymupdf()
+    merged = pymupdf.open()
+    toc = []
+
+    for data, _, part_toc in parts:
+        with pymupdf.open("pdf", data) as part:
+            offset = merged.page_count
+            toc.extend([level, title, page + offset] for level, title, page in part_toc)
+            merged.insert_pdf(part)
+
+    merged.set_toc(toc)
+    merged.save(str(output_path), garbage=1, deflate=True)
+    pages = merged.page_count
+    merged.close()
+
+    return pages
+
+
+def _pymupdf():
+    try:
+        import pymupdf
+    except ImportError:
+        try:
+            import fitz as pymupdf
+        except ImportError:
+            return None
+
+    return pymupdf
+
+
+def _pdf_document():
+    from fontTools.ttLib import TTFont
+
+    template, font_regular, font_mono = _pdf_template()
+    pdf = copy.deepcopy(template)
+
+    for font in pdf.fonts.values():
+        if getattr(font, "ttfont", None) is not None:
+            font.ttfont = TTFont(font.ttffile, recalcTimestamp=False, lazy=True)
+
+    return pdf, font_regular, font_mono
+
+
+def _pdf_template():
+    global _pdf_cache
+
+    if _pdf_cache is not None and _pdf_cache[0] == os.getpid():
+        return _pdf_cache[1:]
+
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+
+    font_dir = Path(__file__).parent / "fonts"
+    regular_font = font_dir / "DejaVuSans.ttf"
+    bold_font = font_dir / "DejaVuSans-Bold.ttf"
+    mono_font = font_dir / "DejaVuSansMono.ttf"
 
-def export(scan_result, filename, fmt, output_dir=None, include_tree=True):
+    if regular_font.exists() and bold_font.exists() and mono_font.exists():
+        pdf.add_font("DejaVu", "", str(regular_font))
+        pdf.add_font("DejaVu", "B", str(bold_font))
+        pdf.add_font("DejaVuMono", "", str(mono_font))
+        font_regular = "DejaVu"
+        font_mono = "DejaVuMono"
+    else:
+        font_regular = "Helvetica"
+        font_mono = "Courier"
+
+    _pdf_cache = (os.getpid(), pdf, font_regular, font_mono)
+    return _pdf_cache[1:]
+
+
+def _pdf_lines(pdf, lines, height, limit=None):
+    x = pdf.l_margin + pdf.c_margin
+    baseline = 0.5 * height + 0.3 * pdf.font_size
+
+    for line in lines:
+        if limit is not None and len(line) > limit:
+            line = line[:limit] + "..."
+
+        if pdf.y + height > pdf.page_break_trigger:
+            pdf.add_page()
+
+        if line:
+            pdf.text(x, pdf.y + baseline, line)
+        pdf.y += height
+
+
+def export(scan_result, filename, fmt, output_dir=None, include_tree=True, compact=False, stats=None,
+           workers=None):
     exporters = {
         "txt": export_txt,
         "md": export_md,
         "json": export_json,
+        "jsonl": export_jsonl,
         "pdf": export_pdf,
     }
 
@@ -289,4 +583,51 @@ def export(scan_result, filename, fmt, output_dir=None, include_tree=True):
     if exporter is None:
         raise ValueError(f"Неподдерживаемый формат: {fmt}")
 
-    return exporter(scan_result, filename, output_dir, include_tree)
\ No newline at end of file
+    if fmt == "json":
+        return exporter(scan_result, filename, output_dir, include_tree, compact)
+
+    if fmt == "pdf":
+        return exporter(scan_result, filename, output_dir, include_tree, stats, workers)
+
+    return exporter(scan_result, filename, output_dir, include_tree)
+
+
+def export_stream(records, root, filename, fmt, output_dir=None, include_tree=True, compact=False):
+    writers = {
+        "txt": _write_txt,
+        "md": _write_md,
+        "json": partial(_write_json, compact=compact),
+        "jsonl": _write_jsonl,
+    }
+
+    writer = writers.get(fmt)
+
+    if writer is None:
+        return export(collect_scan(root, records), filename, fmt, output_dir, include_tree)
+
+    if output_dir is None:
+        output_dir = root
+
+    output_path = Path(output_dir) / f"{filename}.{fmt}"
+
+    with open_sink(output_path) as out:
+        writer(out, records, root, include_tree)
+
+    return output_path
+
+
+def open_sink(output_path):
+    return open(output_path, "w", encoding="utf-8", buffering=SINK_BUFFER_SIZE)
+
+
+def line_writer(out):
+    started = False
+
+    def write_line(text):
+        nonlocal started
+        if started:
+            out.write("\n")
+        started = True
+        out.write(text)
+
+    return write_line
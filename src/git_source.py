@@ -0,0 +1,339 @@
+import os
+import subprocess
+import threading
+from pathlib import Path
+
+from rich.console import Console
+
+from src.scanner import SKIP_DIRECTORIES, build_matcher, collect_scan, dedupe_records
+from src.utils.encoding import BINARY_ENCODING, decode_text, read_text_file
+from src.utils.file_filter import (
+    SNIFF_SIZE,
+    is_binary_content,
+    is_binary_extension,
+    is_generated_content,
+    is_generated_file,
+)
+from src.walker import join_relative
+
+console = Console()
+
+GITLINK_MODE = "160000"
+SYMLINK_MODE = "120000"
+DISCARD_CHUNK_SIZE = 1024 * 1024
+
+
+def scan_git(path, ref="HEAD", max_file_size_mb=10, filters=None, limits=None):
+    root = Path(path).resolve()
+
+    if not root.is_dir():
+        console.print(f"[bold red]Директория не найдена: {root}[/bold red]")
+        return None
+
+    try:
+        entries = list_git_entries(root, ref)
+    except (OSError, subprocess.CalledProcessError) as e:
+        console.print(f"[bold red]Не удалось прочитать git {ref or 'index'}: {_git_error(e)}[/bold red]")
+        return None
+
+    return collect_scan(root, iter_git_scan(root, entries, max_file_size_mb, filters, limits))
+
+
+def scan_git_changes(path, base="HEAD", max_file_size_mb=10, filters=None, limits=None):
+    root = Path(path).resolve()
+
+    if not root.is_dir():
+        console.print(f"[bold red]Директория не найдена: {root}[/bold red]")
+        return None
+
+    try:
+        entries = list_git_entries(root, None)
+        changed = set(_split_paths(
+            _run_git(root, "diff", "--name-only", "--relative", "-z", base, "--")
+        ))
+        untracked = _split_paths(_run_git(root, "ls-files", "--others", "--exclude-standard", "-z"))
+    except (OSError, subprocess.CalledProcessError) as e:
+        console.print(f"[bold red]Не удалось получить изменения относительно {base}: {_git_error(e)}[/bold red]")
+        return None
+
+    entries = [
+        entry for entry in entries
+        if entry[0] not in changed or os.path.lexists(root / entry[0])
+    ]
+
+    for path in untracked:
+        mode = SYMLINK_MODE if os.path.islink(root / path) else "100644"
+        entries.append((path, mode, None, None))
+
+    records = iter_git_scan(
+        root, entries, max_file_size_mb, filters, limits, wanted=changed | set(untracked)
+    )
+    return collect_scan(root, records)
+
+
+def list_git_entries(root, ref="HEAD"):
+    if ref is None:
+        output = _run_git(root, "ls-files", "--stage", "-z")
+    else:
+        output = _run_git(root, "ls-tree", "-r", "-z", "--long", ref)
+
+    entries = []
+
+    for line in output.split(b"\0"):
+        if not line:
+            continue
+
+        info, _, path = line.partition(b"\t")
+        fields = info.split()
+
+        path = _local_path(path)
+
+        if ref is None:
+            if entries and entries[-1][0] == path:
+                continue
+            mode, sha, size = fields[0], fields[1], None
+        else:
+            mode, sha, size = fields[0], fields[2], fields[3]
+            size = int(size) if size.isdigit() else None
+
+        entries.append((path, mode.decode(), sha.decode(), size))
+
+    return entries
+
+
+def iter_git_scan(root, entries, max_file_size_mb=10, filters=None, limits=None, wanted=None):
+    limits = limits or {}
+    records = _iter_git_records(root, entries, max_file_size_mb, filters, limits, wanted)
+
+    if limits.get("dedupe", True):
+        return dedupe_records(records)
+    return records
+
+
+def _iter_git_records(root, entries, max_file_size_mb, filters, limits, wanted=None):
+    matcher = build_matcher(root, {**(filters or {}), "use_gitignore": False})
+    tree = _build_tree(entries)
+    pending = []
+
+    yield from _iter_git_tree(tree, matcher, limits, max_file_size_mb, pending, wanted)
+
+    if wanted is None:
+        yield from _read_blobs(root, pending, max_file_size_mb, limits)
+        return
+
+    yield from _read_worktree(root, pending, max_file_size_mb, limits)
+
+    present = {path for path, _, _, _ in entries}
+    for relative in sorted(wanted - present):
+        yield "skipped", {"path": relative, "reason": "Deleted"}
+
+
+def _build_tree(entries):
+    tree = {}
+
+    for path, mode, sha, size in entries:
+        parts = path.split(os.sep)
+        node = tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = (mode, sha, size)
+
+    return tree
+
+
+def _sorted_children(node, relative):
+    names = sorted(node, key=lambda name: (not isinstance(node[name], dict), name.lower()))
+    return ((name, join_relative(relative, name), node[name]) for name in names)
+
+
+def _iter_git_tree(tree, matcher, limits, max_file_size_mb, pending, wanted=None):
+    max_depth = limits.get("max_depth") or None
+    max_files = limits.get("max_files") or None
+    skip_generated = limits.get("skip_generated", True)
+    max_size = max_file_size_mb * 1024 * 1024
+    files = 0
+    stack = [_sorted_children(tree, "")]
+
+    while stack:
+        item = next(stack[-1], None)
+
+        if item is None:
+            stack.pop()
+            continue
+
+        name, relative, node = item
+
+        if isinstance(node, dict):
+            if name in SKIP_DIRECTORIES:
+                yield "skipped", {"path": relative, "reason": "Excluded directory"}
+            elif matcher.is_ignored(None, relative, True):
+                yield "skipped", {"path": relative, "reason": "Ignored directory"}
+            elif max_depth is not None and relative.count(os.sep) + 1 >= max_depth:
+                yield "skipped", {"path": relative, "reason": "Depth limit reached"}
+            else:
+                yield "structure", {"path": relative, "type": "directory"}
+                stack.append(_sorted_children(node, relative))
+            continue
+
+        mode, sha, size = node
+
+        if matcher.is_ignored(None, relative, False):
+            continue
+
+        if mode == GITLINK_MODE:
+            yield "structure", {"path": relative, "type": "directory"}
+            yield "skipped", {"path": relative, "reason": "Git submodule"}
+            continue
+
+        if max_files is not None and files >= max_files:
+            yield "skipped", {
+                "path": os.path.dirname(relative) or ".",
+                "reason": "File limit reached",
+            }
+            return
+
+        files += 1
+        yield "structure", {"path": relative, "type": "file"}
+
+        if wanted is not None and relative not in wanted:
+            continue
+
+        if mode == SYMLINK_MODE:
+            yield "skipped", {"path": relative, "reason": "Symlink"}
+        elif is_binary_extension(name):
+            yield "skipped", {"path": relative, "reason": "Binary file"}
+        elif skip_generated and is_generated_file(name):
+            yield "skipped", {"path": relative, "reason": "Generated file"}
+        elif size is not None and size > max_size:
+            yield "skipped", {
+                "path": relative,
+                "reason": f"File too large (>{max_file_size_mb}MB)",
+            }
+        else:
+            pending.append((relative, sha))
+
+
+def _read_blobs(root, pending, max_file_size_mb, limits):
+    if not pending:
+        return
+
+    skip_generated = limits.get("skip_generated", True)
+    max_size = max_file_size_mb * 1024 * 1024
+
+    process = subprocess.Popen(
+        ["git", "cat-file", "--batch"],
+        cwd=root,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    feeder = threading.Thread(
+        target=_feed_objects, args=(process.stdin, [sha for _, sha in pending]), daemon=True
+    )
+    feeder.start()
+
+    try:
+        for relative, sha in pending:
+            header = process.stdout.readline().split()
+
+            if len(header) < 3:
+                yield "errors", {"path": relative, "reason": "Failed to read file"}
+                continue
+
+            size = int(header[2])
+
+            if size > max_size:
+                _discard(process.stdout, size + 1)
+                yield "skipped", {
+                    "path": relative,
+                    "reason": f"File too large (>{max_file_size_mb}MB)",
+                }
+                continue
+
+            data = process.stdout.read(size)
+            process.stdout.read(1)
+
+            if is_binary_content(data[:SNIFF_SIZE], ("git", sha)):
+                yield "skipped", {"path": relative, "reason": "Binary content"}
+                continue
+
+            content, encoding = decode_text(data)
+            yield _text_record(relative, content, encoding, skip_generated)
+    finally:
+        process.kill()
+        process.stdout.close()
+        process.wait()
+        feeder.join()
+
+
+def _discard(stream, size):
+    while size > 0:
+        chunk = stream.read(min(size, DISCARD_CHUNK_SIZE))
+        if not chunk:
+            return
+        size -= len(chunk)
+
+
+def _read_worktree(root, pending, max_file_size_mb, limits):
+    skip_generated = limits.get("skip_generated", True)
+    max_size = max_file_size_mb * 1024 * 1024
+
+    for relative, _ in pending:
+        filepath = root / relative
+
+        try:
+            size = filepath.stat().st_size
+        except OSError:
+            yield "errors", {"path": relative, "reason": "Failed to read file"}
+            continue
+
+        if size > max_size:
+            yield "skipped", {
+                "path": relative,
+                "reason": f"File too large (>{max_file_size_mb}MB)",
+            }
+            continue
+
+        content, encoding = read_text_file(filepath, skip_binary=True)
+
+        if encoding == BINARY_ENCODING:
+            yield "skipped", {"path": relative, "reason": "Binary content"}
+        elif content is None:
+            yield "errors", {"path": relative, "reason": "Failed to read file"}
+        else:
+            yield _text_record(relative, content, encoding, skip_generated)
+
+
+def _text_record(relative, content, encoding, skip_generated):
+    if skip_generated and is_generated_content(content[:SNIFF_SIZE], relative):
+        return "skipped", {"path": relative, "reason": "Generated content"}
+    return "files", {"path": relative, "encoding": encoding, "content": content}
+
+
+def _feed_objects(stream, shas):
+    try:
+        for sha in shas:
+            stream.write(f"{sha}\n".encode())
+        stream.close()
+    except (OSError, ValueError):
+        pass
+
+
+def _run_git(root, *args):
+    return subprocess.run(
+        ["git", *args], cwd=root, capture_output=True, check=True
+    ).stdout
+
+
+def _git_error(error):
+    if isinstance(error, subprocess.CalledProcessError):
+        return error.stderr.decode("utf-8", errors="replace").strip() or str(error)
+    return str(error)
+
+
+def _split_paths(output):
+    return [_local_path(path) for path in output.split(b"\0") if path]
+
+
+def _local_path(path):
+    return os.fsdecode(path).replace("/", os.sep)
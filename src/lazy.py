@@ -0,0 +1,91 @@
+from src.utils.encoding import read_text_file, read_text_sample
+
+
+class LazyFileRecord(dict):
+    def __init__(self, source, path, encoding, size, signature=None, sample=None, digest=None):
+        super().__init__(path=path, encoding=encoding)
+        self.source = source
+        self.size = size
+        self.signature = signature
+        self.sample = sample
+        self.digest = digest
+
+    def __missing__(self, key):
+        if key != "content":
+            raise KeyError(key)
+        return self.load()
+
+    def __contains__(self, key):
+        return key == "content" or super().__contains__(key)
+
+    def __iter__(self):
+        yield from super().__iter__()
+        yield "content"
+
+    def __len__(self):
+        return super().__len__() + 1
+
+    def __eq__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __reduce__(self):
+        return type(self), (self.source, self["path"], self["encoding"], self.size, self.signature,
+                            self.sample, self.digest)
+
+    def get(self, key, default=None):
+        if key == "content":
+            return self.load()
+        return super().get(key, default)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def load(self):
+        if self.sample is not None:
+            content, _ = read_text_sample(self.source, *self.sample)
+        else:
+            content, _ = read_text_file(self.source)
+        return content if content is not None else ""
+
+
+def is_lazy(file_data):
+    return isinstance(file_data, LazyFileRecord)
+
+
+def make_lazy(file_data, source, signature=None, digest=None):
+    if is_lazy(file_data):
+        return file_data
+
+    return LazyFileRecord(
+        source,
+        file_data["path"],
+        file_data["encoding"],
+        len(file_data["content"].encode("utf-8")),
+        signature,
+        digest=digest,
+    )
+
+
+def make_eager(file_data):
+    if not is_lazy(file_data):
+        return file_data
+
+    return {
+        "path": file_data["path"],
+        "encoding": file_data["encoding"],
+        "content": file_data.load(),
+    }
+
+
+def content_size(file_data):
+    if is_lazy(file_data):
+        return file_data.size
+    return len(file_data["content"].encode("utf-8"))
@@ -196,6 +196,7 @@ def select_export_format():
         Choice(value="txt", name="TXT — текстовый файл"),
         Choice(value="md", name="MD — Markdown"),
         Choice(value="json", name="JSON — структурированные данные"),
+        Choice(value="jsonl", name="JSONL — по одной записи на строку"),
         Choice(value="pdf", name="PDF — документ"),
     ]
 
@@ -412,6 +413,10 @@ def input_extensions():
     )
 
 
+def input_ignore_patterns(message):
+    return _prompt_text(message)
+
+
 def input_search_query():
     return _prompt_text(
         "Введите часть имени файла для поиска:",
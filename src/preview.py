@@ -1,6 +1,7 @@
 from rich.console import Console
 from rich.table import Table
 
+from src.lazy import content_size
 from src.token_counter import get_scan_tokens, format_token_count
 
 console = Console()
@@ -13,7 +14,7 @@ def show_preview(scan_result):
     )
     total_skipped = len(scan_result["skipped"])
     total_errors = len(scan_result["errors"])
-    total_size = sum(len(f["content"].encode("utf-8")) for f in scan_result["files"])
+    total_size = sum(content_size(f) for f in scan_result["files"])
     token_count = get_scan_tokens(scan_result)
 
     table = Table(title="Предпросмотр сканирования", border_style="bright_blue")
@@ -46,6 +47,63 @@ def show_preview(scan_result):
             console.print(f"  [dim]✗ {item['path']} — {item['reason']}[/dim]")
 
 
+def show_estimate(inventory, estimate):
+    stats = inventory["stats"]
+    interval = (
+        f"{format_token_count(estimate['low'])} – {format_token_count(estimate['high'])}"
+    )
+
+    table = Table(title="Быстрая оценка (без чтения файлов)", border_style="bright_blue")
+    table.add_column("Параметр", style="cyan")
+    table.add_column("Значение", style="green")
+
+    table.add_row("Корневая директория", inventory["root"])
+    table.add_row("Директорий", str(stats["directories"]))
+    table.add_row("Файлов (будут прочитаны)", str(estimate["files"]))
+    table.add_row("Пропущено", str(stats["files"] - estimate["files"] + len(inventory["skipped"])))
+    table.add_row("Общий размер", _format_size(estimate["bytes"]))
+    table.add_row("Токенов (≈)", format_token_count(estimate["tokens"]))
+    table.add_row("Интервал 95%", interval)
+    table.add_row("Файлов в выборке", str(estimate["sampled"]))
+
+    console.print(table)
+
+    if estimate["tokens"] > 128000:
+        console.print("[bold red]⚠ Вероятно превышает контекст GPT-4 (128K)[/bold red]")
+    elif estimate["tokens"] > 32000:
+        console.print("[yellow]⚠ Большой объём для некоторых моделей[/yellow]")
+
+
+def show_inventory(inventory):
+    stats = inventory["stats"]
+
+    table = Table(title="Инвентаризация", border_style="bright_blue")
+    table.add_column("Параметр", style="cyan")
+    table.add_column("Значение", style="green")
+
+    table.add_row("Корневая директория", inventory["root"])
+    table.add_row("Директорий", str(stats["directories"]))
+    table.add_row("Файлов", str(stats["files"]))
+    table.add_row("Пропущено", str(len(inventory["skipped"])))
+    table.add_row("Ошибок", str(len(inventory["errors"])))
+    table.add_row("Общий размер", _format_size(stats["total_bytes"]))
+
+    console.print(table)
+
+    extensions = Table(title="По расширениям", border_style="bright_blue")
+    extensions.add_column("Расширение", style="cyan")
+    extensions.add_column("Файлов", style="green", justify="right")
+    extensions.add_column("Размер", style="green", justify="right")
+
+    ordered = sorted(stats["extensions"].items(), key=lambda item: -item[1]["bytes"])
+    for extension, totals in ordered:
+        extensions.add_row(
+            extension or "(без расширения)", str(totals["files"]), _format_size(totals["bytes"])
+        )
+
+    console.print(extensions)
+
+
 def _format_size(size_bytes):
     if size_bytes < 1024:
         return f"{size_bytes} B"
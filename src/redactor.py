@@ -1,5 +1,7 @@
 import re
 
+from src.lazy import is_lazy
+
 
 PATTERNS = {
     "API Key": re.compile(
@@ -55,29 +57,43 @@ def redact_content(content, enabled_patterns=None):
     return redacted, findings
 
 
-def redact_scan_result(scan_result, enabled_patterns=None):
+def redact_file_record(file_data, enabled_patterns=None):
+    redacted_content, findings = redact_content(file_data["content"], enabled_patterns)
+
+    redacted_record = {
+        "path": file_data["path"],
+        "encoding": file_data["encoding"],
+        "content": redacted_content,
+    }
+
+    return redacted_record, findings
+
+
+def redact_scan_result(scan_result, enabled_patterns=None, cache=None):
     redacted_result = {
         "root": scan_result["root"],
         "structure": scan_result["structure"],
         "files": [],
         "skipped": scan_result["skipped"],
         "errors": scan_result["errors"],
+        "manifest": scan_result.get("manifest", []),
     }
 
     total_findings = []
 
     for file_data in scan_result["files"]:
-        redacted_content, findings = redact_content(
-            file_data["content"], enabled_patterns
-        )
-
-        redacted_result["files"].append(
-            {
-                "path": file_data["path"],
-                "encoding": file_data["encoding"],
-                "content": redacted_content,
-            }
-        )
+        cached = cache.get(file_data["path"]) if cache is not None else None
+
+        token = file_data if is_lazy(file_data) else file_data["content"]
+
+        if cached is not None and cached[0] is token:
+            _, redacted_record, findings = cached
+        else:
+            redacted_record, findings = redact_file_record(file_data, enabled_patterns)
+            if cache is not None:
+                cache[file_data["path"]] = (token, redacted_record, findings)
+
+        redacted_result["files"].append(redacted_record)
 
         if findings:
             total_findings.append(
@@ -87,5 +103,20 @@ def redact_scan_result(scan_result, enabled_patterns=None):
     return redacted_result, total_findings
 
 
+def redact_records(records, enabled_patterns=None, total_findings=None):
+    for key, record in records:
+        if key == "files":
+            redacted_record, findings = redact_file_record(record, enabled_patterns)
+
+            if findings and total_findings is not None:
+                total_findings.append(
+                    {"file": record["path"], "findings": findings}
+                )
+
+            record = redacted_record
+
+        yield key, record
+
+
 def get_available_patterns():
     return list(PATTERNS.keys())
\ No newline at end of file
@@ -1,11 +1,30 @@
+import bisect
+import hashlib
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from rich.console import Console
 from rich.tree import Tree
 
-from src.utils.file_filter import is_binary_extension, is_within_size_limit
-from src.utils.encoding import detect_file_encoding, read_file_safe
-from src.utils.safety import check_access
+from src.utils.file_filter import (
+    SNIFF_SIZE,
+    cached_binary_verdict,
+    is_binary_extension,
+    is_generated_content,
+    is_generated_file,
+    is_within_size_limit,
+)
+from src.utils.encoding import BINARY_ENCODING, read_text_file, read_text_sample
+from src.archive import is_archive, scan_archive
+from src.lazy import LazyFileRecord, content_size, is_lazy, make_eager, make_lazy
+from src.token_counter import count_tokens
+from src.tree_model import build_tree_model, get_tree_model
+from src.utils.ignore import IGNORE_FILES, IgnoreMatcher, compile_globs, match_glob_index
+from src.walker import find_entry, walk, walk_entry
 
 console = Console()
 
@@ -21,8 +40,96 @@ SKIP_DIRECTORIES = {
     ".vscode",
 }
 
+WALK_SKIP_REASONS = {
+    "excluded": "Excluded directory",
+    "ignored": "Ignored directory",
+    "depth": "Depth limit reached",
+    "symlink": "Symlinked directory",
+    "visited": "Symlink target already visited",
+    "outside": "Symlink outside root",
+    "limit": "File limit reached",
+}
+
+DIRECTORY_SKIP_REASONS = set(WALK_SKIP_REASONS.values())
+
+READ_SKIP_REASONS = {
+    "Binary content",
+    "Generated content",
+    "Over budget",
+}
+
+BYTES_PER_TOKEN = 4
+
+RACY_MTIME_WINDOW_NS = 2 * 10**9
+
+
+def scan_directory(path, max_file_size_mb=10, jobs=1, previous=None, filters=None, lazy=False,
+                   limits=None, budget=None):
+    records = iter_scan(path, max_file_size_mb, jobs, previous, filters, lazy, limits, budget)
+
+    if records is None:
+        return None
+
+    return collect_scan(Path(path).resolve(), records)
+
+
+def iter_scan(path, max_file_size_mb=10, jobs=1, previous=None, filters=None, lazy=False,
+              limits=None, budget=None):
+    root = _resolve_root(path)
+
+    if root is None:
+        return None
+
+    matcher = build_matcher(root, filters)
+    return _iter_scan(root, max_file_size_mb, jobs, previous, matcher, lazy, limits, budget)
+
+
+def scan_inventory(path, filters=None, limits=None):
+    root = _resolve_root(path)
+
+    if root is None:
+        return None
+
+    result = collect_scan(root, [])
+    stats = {"directories": 0, "files": 0, "total_bytes": 0, "extensions": {}}
+    result["stats"] = stats
+    matcher = build_matcher(root, filters)
+
+    for kind, relative, entry in walk(root, SKIP_DIRECTORIES, matcher=matcher, limits=limits):
+        if kind == "error":
+            result["errors"].append({"path": relative, "reason": "Access Denied"})
+
+        elif kind in WALK_SKIP_REASONS:
+            result["skipped"].append({"path": relative, "reason": WALK_SKIP_REASONS[kind]})
+
+        elif kind == "directory":
+            stats["directories"] += 1
+            result["structure"].append({"path": relative, "type": "directory"})
+
+        else:
+            record = {"path": relative, "type": "file"}
+            signature = _stat_signature(entry)
 
-def scan_directory(path, max_file_size_mb=10):
+            if signature is None:
+                result["errors"].append({"path": relative, "reason": "Access Denied"})
+            else:
+                record["size"] = signature["size"]
+                record["mtime"] = signature["mtime_ns"] / 1e9
+
+            size = record.get("size", 0)
+            extension = stats["extensions"].setdefault(
+                Path(entry.name).suffix.lower(), {"files": 0, "bytes": 0}
+            )
+            extension["files"] += 1
+            extension["bytes"] += size
+            stats["files"] += 1
+            stats["total_bytes"] += size
+            result["structure"].append(record)
+
+    return result
+
+
+def _resolve_root(path):
     root = Path(path).resolve()
 
     if not root.exists():
@@ -33,166 +140,784 @@ def scan_directory(path, max_file_size_mb=10):
         console.print(f"[bold red]Это не директория: {root}[/bold red]")
         return None
 
+    return root
+
+
+def scan_directories(paths, max_file_size_mb=10, workers=None, filters=None, limits=None,
+                     lazy=False, use_previous=True, budget=None):
+    paths = [str(path) for path in paths]
+    options = (max_file_size_mb, filters, limits, lazy, use_previous, budget)
+    workers = min(len(paths), workers or os.cpu_count() or 1)
+    executor = None
+
+    if workers > 1:
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        except (OSError, NotImplementedError):
+            executor = None
+
+    if executor is None:
+        for path in paths:
+            yield path, _scan_root(path, *options)
+        return
+
+    try:
+        futures = {executor.submit(_scan_root, path, *options): path for path in paths}
+
+        for future in as_completed(futures):
+            path = futures[future]
+
+            try:
+                result = future.result()
+            except Exception as e:
+                console.print(f"[bold red]Ошибка сканирования {path}: {e}[/bold red]")
+                result = None
+
+            yield path, result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _scan_root(path, max_file_size_mb, filters, limits, lazy, use_previous, budget=None):
+    previous = None
+
+    if use_previous:
+        from src.session import load_previous_scan
+        previous = load_previous_scan(path)
+
+    return scan_directory(path, max_file_size_mb, 1, previous, filters, lazy, limits, budget)
+
+
+def collect_scan(root, records):
     result = {
         "root": str(root),
         "structure": [],
         "files": [],
         "skipped": [],
         "errors": [],
+        "manifest": [],
     }
 
-    _scan_recursive(root, root, result, max_file_size_mb)
+    for key, record in records:
+        result[key].append(record)
+
+    result["tree"] = build_tree_model(result["structure"], result["files"])
     return result
 
 
-def _scan_recursive(current_path, root, result, max_file_size_mb):
-    if not check_access(current_path):
-        result["errors"].append(
-            {"path": str(current_path.relative_to(root)), "reason": "Access Denied"}
+def iter_records(scan_result):
+    for key in ("structure", "skipped", "errors", "files"):
+        for record in scan_result[key]:
+            yield key, record
+
+
+def _has_budget(budget):
+    return bool(budget and (budget.get("max_tokens") or budget.get("max_bytes")))
+
+
+def build_matcher(root, filters=None):
+    filters = filters or {}
+
+    return IgnoreMatcher(
+        root,
+        exclude=filters.get("exclude") or (),
+        include=filters.get("include") or (),
+        use_gitignore=filters.get("use_gitignore", True),
+    )
+
+
+def _iter_scan(root, max_file_size_mb, jobs=1, previous=None, matcher=None, lazy=False,
+               limits=None, budget=None):
+    reusable = _index_previous_scan(root, previous)
+    events = walk(root, SKIP_DIRECTORIES, matcher=matcher, limits=limits)
+
+    if _has_budget(budget):
+        records = _iter_budget_events(
+            events, max_file_size_mb, jobs, reusable, lazy, budget, limits
         )
-        return
+    else:
+        records = _iter_events(events, max_file_size_mb, jobs, reusable, lazy, limits)
+
+    if (limits or {}).get("dedupe", True):
+        return dedupe_records(records)
+    return records
+
+
+def dedupe_records(records, seen=None):
+    seen = {} if seen is None else seen
+    duplicates = set()
+    pending = None
+
+    for key, record in records:
+        if pending is not None:
+            known = None
+            if key == "manifest" and record["path"] == pending["path"]:
+                known = record.get("hash")
+            yield from _dedupe_file(pending, _record_digest(pending, known), seen, duplicates)
+            pending = None
+
+        if key == "files":
+            if not is_lazy(record):
+                pending = record
+                continue
+            yield from _dedupe_file(record, _record_digest(record), seen, duplicates)
+            continue
+
+        if key == "manifest" and record["path"] in duplicates:
+            continue
+
+        yield key, record
+
+    if pending is not None:
+        yield from _dedupe_file(pending, _record_digest(pending), seen, duplicates)
+
+
+def _dedupe_file(record, digest, seen, duplicates):
+    original = seen.setdefault(digest, record["path"]) if digest else None
+
+    if original is not None and original != record["path"]:
+        duplicates.add(record["path"])
+        yield "skipped", {
+            "path": record["path"],
+            "reason": f"Identical to {original}",
+            "original": original,
+        }
+    else:
+        yield "files", record
+
+
+def _record_digest(file_data, known=None):
+    if is_lazy(file_data):
+        if not file_data.size:
+            return None
+        return file_data.digest or _content_hash(file_data.load())
+
+    if not file_data["content"]:
+        return None
+    return known or _content_hash(file_data["content"])
+
+
+def _sample_sizes(limits):
+    limits = limits or {}
+    head = int((limits.get("sample_head_kb") or 0) * 1024)
+    tail = int((limits.get("sample_tail_kb") or 0) * 1024)
+
+    if not head and not tail:
+        return None
+    return head, tail
+
+
+def _iter_events(events, max_file_size_mb, jobs, reusable, lazy=False, limits=None):
+    queue = _ReadQueue(jobs)
 
     try:
-        entries = sorted(current_path.iterdir(), key=lambda e: (e.is_file(), e.name.lower()))
-    except PermissionError:
-        result["errors"].append(
-            {"path": str(current_path.relative_to(root)), "reason": "Permission Error"}
-        )
-        return
+        for key, value in _iter_tree(events, max_file_size_mb, reusable, lazy, limits):
+            if key == "read":
+                queue.add_read(value)
+            elif key == "ready":
+                queue.add_ready(value)
+            else:
+                yield key, value
+
+        yield from queue.drain()
+    finally:
+        queue.close()
+
+
+class _ReadQueue:
+    def __init__(self, jobs):
+        self.executor = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        self.max_in_flight = jobs * 4
+        self.in_flight = 0
+        self.scheduled = deque()
+        self.waiting = deque()
+
+    def add_read(self, task):
+        self.waiting.append(task)
+        self._schedule()
+
+    def add_ready(self, records):
+        self.waiting.append(records)
+        self._schedule()
+
+    def drain(self):
+        while self.scheduled or self.waiting:
+            if self.scheduled:
+                head = self.scheduled.popleft()
+                if isinstance(head, Future):
+                    self.in_flight -= 1
+                    yield from head.result()
+                else:
+                    yield from head
+            else:
+                head = self.waiting.popleft()
+                if isinstance(head, tuple):
+                    yield from _read_file_records(*head)
+                else:
+                    yield from head
+
+            self._schedule()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def _schedule(self):
+        while self.waiting:
+            head = self.waiting[0]
+
+            if isinstance(head, tuple):
+                if self.executor is None or self.in_flight >= self.max_in_flight:
+                    return
+                head = self.executor.submit(_read_file_records, *head)
+                self.in_flight += 1
+
+            self.waiting.popleft()
+            self.scheduled.append(head)
+
+
+def _iter_budget_events(events, max_file_size_mb, jobs, reusable, lazy, budget, limits=None):
+    pending = []
+
+    for key, value in _iter_tree(events, max_file_size_mb, reusable, lazy, limits):
+        if key == "read":
+            pending.append((value[1], value[2], value))
+        elif key == "ready" and not isinstance(value, list):
+            for record in value:
+                if record[0] == "files":
+                    pending.append((record[1]["path"], None, [record]))
+                else:
+                    pending.append((None, None, [record]))
+        elif key == "ready" and value[0][0] == "files":
+            signature = value[1][1] if len(value) > 1 else None
+            pending.append((value[0][1]["path"], signature, value))
+        elif key == "ready":
+            pending.append((None, None, value))
+        else:
+            yield key, value
+
+    results = _read_within_budget(pending, jobs, budget, (limits or {}).get("dedupe", True))
+
+    for records in results:
+        yield from records
+
+
+def _read_within_budget(pending, jobs, budget, dedupe=False):
+    patterns = compile_globs(budget.get("priority") or ())
+    prefer_recent = budget.get("order") == "recent"
+    tokens = bool(budget.get("max_tokens"))
+    remaining = budget["max_tokens"] if tokens else budget["max_bytes"]
+    charged = set()
+    charged_sizes = set()
+
+    def priority(index):
+        relative, signature, _ = pending[index]
+        signature = signature or {}
+        rank = match_glob_index(patterns, relative)
+        size = signature.get("size", 0)
+        if prefer_recent:
+            return rank, -signature.get("mtime_ns", 0), size
+        return rank, size
+
+    results = [value if relative is None else None for relative, _, value in pending]
+    order = sorted(
+        (index for index, (relative, _, _) in enumerate(pending) if relative is not None),
+        key=priority,
+    )
+    executor = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
 
-    for entry in entries:
-        relative = entry.relative_to(root)
+    try:
+        for start in range(0, len(order), max(1, jobs)):
+            batch = []
+
+            for index in order[start:start + max(1, jobs)]:
+                relative, signature, value = pending[index]
+                size = (signature or {}).get("size", 0)
+                if not isinstance(value, list) and value[4] is not None:
+                    size = min(size, sum(value[4]))
+                estimate = size // BYTES_PER_TOKEN if tokens else size
+
+                if estimate > remaining and not (dedupe and size in charged_sizes):
+                    results[index] = [("skipped", {"path": relative, "reason": "Over budget"})]
+                else:
+                    batch.append(index)
+
+            if executor is not None:
+                loaded = executor.map(lambda index: _load_pending(pending[index][2], tokens), batch)
+            else:
+                loaded = map(lambda index: _load_pending(pending[index][2], tokens), batch)
 
-        if entry.is_dir():
-            if entry.name in SKIP_DIRECTORIES:
-                result["skipped"].append(
-                    {"path": str(relative), "reason": "Excluded directory"}
-                )
-                continue
+            for index, records in zip(batch, loaded):
+                digest = _pending_digest(records) if dedupe else None
 
-            result["structure"].append(
-                {"path": str(relative), "type": "directory"}
-            )
-            _scan_recursive(entry, root, result, max_file_size_mb)
+                if digest is not None and digest in charged:
+                    results[index] = records
+                    continue
 
-        elif entry.is_file():
-            result["structure"].append(
-                {"path": str(relative), "type": "file"}
-            )
+                cost = _budget_cost(records, tokens)
 
-            if is_binary_extension(entry):
-                result["skipped"].append(
-                    {"path": str(relative), "reason": "Binary file"}
-                )
+                if cost > remaining:
+                    relative = pending[index][0]
+                    results[index] = [("skipped", {"path": relative, "reason": "Over budget"})]
+                    continue
+
+                remaining -= cost
+                results[index] = records
+
+                if digest is not None:
+                    charged.add(digest)
+                    charged_sizes.add((pending[index][1] or {}).get("size", 0))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    return results
+
+
+def _load_pending(value, tokens=False):
+    if not isinstance(value, list):
+        if tokens:
+            value = value[:3] + (False,) + value[4:]
+        value = _read_file_records(*value)
+
+    if tokens:
+        value = [(key, make_eager(record) if key == "files" else record) for key, record in value]
+    return value
+
+
+def _budget_cost(records, tokens):
+    files = [record for key, record in records if key == "files"]
+
+    if tokens:
+        return sum(count_tokens(record["content"]) for record in files)
+    return sum(content_size(record) for record in files)
+
+
+def _pending_digest(records):
+    known = None
+
+    for key, record in records:
+        if key == "manifest":
+            known = record.get("hash")
+
+    for key, record in records:
+        if key == "files":
+            return _record_digest(record, known)
+    return None
+
+
+def _iter_tree(events, max_file_size_mb, reusable, lazy=False, limits=None):
+    sample = _sample_sizes(limits)
+    skip_generated = (limits or {}).get("skip_generated", True)
+    archives = (limits or {}).get("archives", False)
+
+    for kind, relative, entry in events:
+        if kind == "error":
+            yield "errors", {"path": relative, "reason": "Access Denied"}
+
+        elif kind in WALK_SKIP_REASONS:
+            yield "skipped", {"path": relative, "reason": WALK_SKIP_REASONS[kind]}
+
+        elif kind == "directory":
+            yield "structure", {"path": relative, "type": "directory"}
+
+        else:
+            if archives and is_archive(entry.name):
+                records = scan_archive(entry.path, relative, max_file_size_mb, limits)
+
+                if records is not None:
+                    yield "structure", {"path": relative, "type": "directory"}
+                    yield from records[0]
+                    yield "ready", records[1]
+                    continue
+
+                yield "errors", {"path": relative, "reason": "Failed to read archive"}
+
+            yield "structure", {"path": relative, "type": "file"}
+
+            if is_binary_extension(entry.name):
+                yield "skipped", {"path": relative, "reason": "Binary file"}
                 continue
 
-            if not is_within_size_limit(entry, max_file_size_mb):
-                result["skipped"].append(
-                    {"path": str(relative), "reason": f"File too large (>{max_file_size_mb}MB)"}
-                )
+            if skip_generated and is_generated_file(entry.name):
+                yield "skipped", {"path": relative, "reason": "Generated file"}
                 continue
 
-            encoding = detect_file_encoding(entry)
-            content = read_file_safe(entry, encoding)
+            sampled = None
 
-            if content is not None:
-                result["files"].append(
-                    {
-                        "path": str(relative),
-                        "encoding": encoding,
-                        "content": content,
+            if not is_within_size_limit(entry, max_file_size_mb):
+                if sample is None:
+                    yield "skipped", {
+                        "path": relative,
+                        "reason": f"File too large (>{max_file_size_mb}MB)",
                     }
-                )
+                    continue
+                sampled = sample
+
+            signature = _stat_signature(entry)
+            cached = _find_reusable(reusable, relative, signature)
+
+            if cached is not None:
+                manifest, file_data = cached
+
+                if skip_generated and not manifest.get("skip_generated"):
+                    if is_generated_content(file_data["content"][:SNIFF_SIZE], relative):
+                        yield "ready", [
+                            ("skipped", {"path": relative, "reason": "Generated content"})
+                        ]
+                        continue
+                    manifest = {**manifest, "skip_generated": True}
+
+                if lazy:
+                    file_data = make_lazy(file_data, entry.path, signature, manifest["hash"])
+                else:
+                    file_data = make_eager(file_data)
+                yield "ready", [("files", file_data), ("manifest", manifest)]
+            elif cached_binary_verdict(_sniff_key(signature)):
+                yield "ready", [("skipped", {"path": relative, "reason": "Binary content"})]
             else:
-                result["errors"].append(
-                    {"path": str(relative), "reason": "Failed to read file"}
-                )
+                yield "read", (entry.path, relative, signature, lazy, sampled, skip_generated)
+
+
+def _read_file_records(filepath, relative, signature=None, lazy=False, sample=None,
+                       skip_generated=False):
+    if sample is None:
+        content, encoding = read_text_file(
+            filepath, skip_binary=True, cache_key=_sniff_key(signature)
+        )
+    else:
+        content, encoding = read_text_sample(
+            filepath, *sample, skip_binary=True, cache_key=_sniff_key(signature)
+        )
+
+    if encoding == BINARY_ENCODING:
+        return [("skipped", {"path": relative, "reason": "Binary content"})]
+
+    if content is None:
+        return [("errors", {"path": relative, "reason": "Failed to read file"})]
+
+    if skip_generated and is_generated_content(content[:SNIFF_SIZE], relative):
+        return [("skipped", {"path": relative, "reason": "Generated content"})]
+
+    digest = _content_hash(content)
+
+    if lazy:
+        file_data = LazyFileRecord(
+            filepath, relative, encoding, len(content.encode("utf-8")), signature, sample, digest
+        )
+    else:
+        file_data = {
+            "path": relative,
+            "encoding": encoding,
+            "content": content,
+        }
+
+    records = [("files", file_data)]
+
+    if signature is not None and sample is None:
+        racy = time.time_ns() - signature["mtime_ns"] < RACY_MTIME_WINDOW_NS
+        records.append(
+            ("manifest", {
+                "path": relative,
+                **signature,
+                "hash": None if racy else digest,
+                "skip_generated": skip_generated,
+            })
+        )
+
+    return records
+
+
+def _stat_signature(entry):
+    try:
+        stat = entry.stat()
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "inode": entry.inode(),
+            "dev": stat.st_dev,
+        }
+    except OSError:
+        return None
+
+
+def _sniff_key(signature):
+    if signature is None:
+        return None
+    return signature.get("dev"), signature["inode"], signature["mtime_ns"]
+
+
+def _content_hash(content):
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _index_previous_scan(root, previous):
+    if not previous or previous.get("root") != str(root):
+        return {}
+
+    files = {file_data["path"]: file_data for file_data in previous.get("files", [])}
+    reusable = {}
+
+    for entry in previous.get("manifest", []):
+        file_data = files.get(entry.get("path"))
+        if file_data is not None and entry.get("hash"):
+            reusable[entry["path"]] = (entry, file_data)
+
+    return reusable
+
+
+def _find_reusable(reusable, relative, signature):
+    cached = reusable.get(relative)
+
+    if cached is None or signature is None:
+        return None
+
+    entry, file_data = cached
+
+    if any(entry.get(key) != value for key, value in signature.items()):
+        return None
+
+    if not is_lazy(file_data) and _content_hash(file_data["content"]) != entry["hash"]:
+        return None
 
+    return cached
 
-def get_subdirectories(path):
+
+def rescan_paths(scan_result, relative_paths, max_file_size_mb=10, filters=None, lazy=False,
+                 limits=None, budget=None):
+    root = Path(scan_result["root"])
+    scan_result.setdefault("manifest", [])
+    scan_result.pop("tree", None)
+    matcher = build_matcher(root, filters)
+
+    relative_paths = {
+        os.path.dirname(relative) if os.path.basename(relative) in IGNORE_FILES else relative
+        for relative in relative_paths
+    }
+
+    if (
+        _has_budget(budget)
+        or (limits or {}).get("archives")
+        or "" in relative_paths
+        or "." in relative_paths
+        or _originals_changed(scan_result, relative_paths)
+    ):
+        _rescan_all(scan_result, root, max_file_size_mb, matcher, lazy, limits, budget)
+        return
+
+    directories = {
+        item["path"] for item in scan_result["structure"] if item["type"] == "directory"
+    }
+    units = set()
+
+    for relative in relative_paths:
+        parent = os.path.dirname(relative)
+        while parent and parent not in directories:
+            relative, parent = parent, os.path.dirname(parent)
+        units.add(relative)
+
+    units = [
+        relative for relative in sorted(units)
+        if not any(relative.startswith(other + os.sep) for other in units)
+    ]
+    removed = [_remove_unit(scan_result, relative) for relative in units]
+
+    for relative, records in zip(units, removed):
+        if not _rescan_unit(
+            scan_result, root, relative, records, max_file_size_mb, matcher, lazy, limits
+        ):
+            _rescan_all(scan_result, root, max_file_size_mb, matcher, lazy, limits, budget)
+            return
+
+
+def _rescan_all(scan_result, root, max_file_size_mb, matcher, lazy=False, limits=None,
+                budget=None):
+    refreshed = collect_scan(
+        root, _iter_scan(
+            root, max_file_size_mb, previous=scan_result, matcher=matcher, lazy=lazy,
+            limits=limits, budget=budget,
+        )
+    )
+    for key in ("structure", "files", "skipped", "errors", "manifest"):
+        scan_result[key][:] = refreshed[key]
+
+
+def _originals_changed(scan_result, relative_paths):
+    for record in scan_result["skipped"]:
+        original = record.get("original")
+        if original is None:
+            continue
+        if any(original == path or original.startswith(path + os.sep) for path in relative_paths):
+            return True
+
+    return False
+
+
+def _remove_unit(scan_result, relative):
+    prefix = relative + os.sep
+    removed = {}
+
+    for key in ("structure", "files", "skipped", "errors", "manifest"):
+        kept = []
+        removed[key] = []
+        for record in scan_result[key]:
+            if record["path"] == relative or record["path"].startswith(prefix):
+                removed[key].append(record)
+            else:
+                kept.append(record)
+        scan_result[key][:] = kept
+
+    return removed
+
+
+def _rescan_unit(scan_result, root, relative, removed, max_file_size_mb, matcher, lazy=False,
+                 limits=None):
+    reusable = _index_previous_scan(root, {
+        "root": scan_result["root"],
+        "files": removed["files"],
+        "manifest": removed["manifest"],
+    })
+
+    parent, _, name = relative.rpartition(os.sep)
+    entry = find_entry(root / parent if parent else root, name)
+    if entry is None:
+        return True
+
+    batches = {}
+    scope = matcher.scope_for(parent)
+    events = walk_entry(
+        entry, relative, SKIP_DIRECTORIES,
+        matcher=matcher, scope=scope, limits=limits, root=str(root),
+    )
+
+    records = _iter_events(events, max_file_size_mb, 1, reusable, lazy, limits)
+
+    if (limits or {}).get("dedupe", True):
+        hashes = {entry["path"]: entry.get("hash") for entry in scan_result["manifest"]}
+        seen = {}
+        for file_data in scan_result["files"]:
+            digest = _record_digest(file_data, hashes.get(file_data["path"]))
+            if digest:
+                seen.setdefault(digest, file_data["path"])
+        records = dedupe_records(records, seen)
+
+    for key, record in records:
+        batches.setdefault((key, _is_read_skip(key, record)), []).append(record)
+
+    for record in batches.get(("skipped", True), ()):
+        original = record.get("original")
+        if original is not None and _walk_key(original) > _walk_key(record["path"]):
+            return False
+
+    for (key, _), batch in batches.items():
+        records = scan_result[key]
+
+        if key == "errors":
+            records.extend(batch)
+            continue
+
+        position = bisect.bisect_left(
+            records,
+            _record_order_key(key, batch[0]),
+            key=lambda record: _record_order_key(key, record),
+        )
+        records[position:position] = batch
+
+    return True
+
+
+def _walk_key(path):
+    return _record_order_key("files", {"path": path})
+
+
+def _record_order_key(key, record):
+    if key == "structure":
+        is_file = record["type"] == "file"
+    elif key == "skipped":
+        is_file = record["reason"] not in DIRECTORY_SKIP_REASONS
+    else:
+        is_file = True
+
+    parts = record["path"].split(os.sep)
+    path_key = tuple((False, part.lower()) for part in parts[:-1]) + ((is_file, parts[-1].lower()),)
+    return (_is_read_skip(key, record),) + path_key
+
+
+def _is_read_skip(key, record):
+    return key == "skipped" and (record["reason"] in READ_SKIP_REASONS or "original" in record)
+
+
+def get_subdirectories(path, filters=None):
     root = Path(path).resolve()
 
     if not root.exists() or not root.is_dir():
         return []
 
+    matcher = build_matcher(root, filters)
+    scope = matcher.scope_for("")
+
     return [
         entry
         for entry in sorted(root.iterdir())
-        if entry.is_dir() and entry.name not in SKIP_DIRECTORIES
+        if entry.is_dir()
+        and entry.name not in SKIP_DIRECTORIES
+        and not matcher.is_ignored(scope, entry.name, True)
     ]
 
 
 def build_tree_view(scan_result):
     root_path = scan_result["root"]
     tree = Tree(f"[bold blue]{root_path}[/bold blue]")
-    nodes = {}
+    model = get_tree_model(scan_result)
+    nodes = []
 
-    for item in scan_result["structure"]:
-        path = Path(item["path"])
-        parts = path.parts
-
-        parent_key = str(path.parent) if len(parts) > 1 else None
-        current_key = str(path)
-
-        if item["type"] == "directory":
-            label = f"[bold yellow]📁 {path.name}[/bold yellow]"
-        else:
-            label = f"[dim]📄 {path.name}[/dim]"
-
-        if parent_key and parent_key in nodes:
-            node = nodes[parent_key].add(label)
+    for name, is_dir, parent in zip(model["names"], model["is_dir"], model["parent"]):
+        if is_dir:
+            label = f"[bold yellow]📁 {name}[/bold yellow]"
         else:
-            node = tree.add(label)
+            label = f"[dim]📄 {name}[/dim]"
 
-        if item["type"] == "directory":
-            nodes[current_key] = node
+        nodes.append((nodes[parent] if parent >= 0 else tree).add(label))
 
     return tree
 
 
-def collect_text_files(path, max_file_size_mb=10):
+def collect_text_files(path, max_file_size_mb=10, filters=None, limits=None):
     root = Path(path).resolve()
 
     if not root.exists() or not root.is_dir():
         return []
 
     files = []
-    _collect_recursive(root, files, max_file_size_mb, text_only=True)
+    _collect_files(root, files, max_file_size_mb, True, filters, limits)
     return files
 
 
-def collect_all_files(path, max_file_size_mb=10):
+def collect_all_files(path, max_file_size_mb=10, filters=None, limits=None):
     root = Path(path).resolve()
 
     if not root.exists() or not root.is_dir():
         return []
 
     files = []
-    _collect_recursive(root, files, max_file_size_mb, text_only=False)
+    _collect_files(root, files, max_file_size_mb, False, filters, limits)
     return files
 
 
-def _collect_recursive(current_path, files, max_file_size_mb, text_only=True):
-    if not check_access(current_path):
-        return
+def _collect_files(root, files, max_file_size_mb, text_only=True, filters=None, limits=None):
+    matcher = build_matcher(root, filters)
+    events = walk(root, SKIP_DIRECTORIES, dirs_first=False, matcher=matcher, limits=limits)
 
-    try:
-        entries = sorted(current_path.iterdir(), key=lambda e: e.name.lower())
-    except PermissionError:
-        return
-
-    for entry in entries:
-        if entry.is_dir():
-            if entry.name in SKIP_DIRECTORIES:
-                continue
-            _collect_recursive(entry, files, max_file_size_mb, text_only)
-
-        elif entry.is_file():
-            if text_only and is_binary_extension(entry):
-                continue
-            if not is_within_size_limit(entry, max_file_size_mb):
-                continue
-            files.append(entry)
+    for kind, _, entry in events:
+        if kind != "file":
+            continue
+        if text_only and is_binary_extension(entry.name):
+            continue
+        if not is_within_size_limit(entry, max_file_size_mb):
+            continue
+        files.append(Path(entry.path))
 
 
 def scan_selected_files(selected_files, root_path):
@@ -233,10 +958,13 @@ def scan_selected_files(selected_files, root_path):
             )
             continue
 
-        encoding = detect_file_encoding(filepath)
-        content = read_file_safe(filepath, encoding)
+        content, encoding = read_text_file(filepath, skip_binary=True)
 
-        if content is not None:
+        if encoding == BINARY_ENCODING:
+            result["skipped"].append(
+                {"path": str(relative), "reason": "Binary content (included by selection)"}
+            )
+        elif content is not None:
             result["files"].append(
                 {
                     "path": str(relative),
@@ -249,7 +977,7 @@ def scan_selected_files(selected_files, root_path):
                 {"path": str(relative), "reason": "Failed to read file"}
             )
 
-    result["structure"].sort(key=lambda x: x["path"])
+    result["structure"].sort(key=lambda x: _record_order_key("structure", x))
 
     return result
 
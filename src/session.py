@@ -58,19 +58,21 @@ def set_sessions_root(directory):
     return path
 
 
+def _get_session_name(scan_root):
+    scan_path = Path(scan_root).resolve()
+    safe_name = scan_path.name or "root"
+
+    path_hash = hashlib.md5(str(scan_path).encode()).hexdigest()[:8]
+    return f"{safe_name}_{path_hash}"
+
+
 def _get_session_dir_for_scan(scan_root):
     sessions_root = get_sessions_root()
     if sessions_root is None:
         sessions_root = DEFAULT_SESSIONS_ROOT
         sessions_root.mkdir(parents=True, exist_ok=True)
 
-    scan_path = Path(scan_root).resolve()
-    safe_name = scan_path.name or "root"
-
-    path_hash = hashlib.md5(str(scan_path).encode()).hexdigest()[:8]
-    session_name = f"{safe_name}_{path_hash}"
-
-    session_dir = sessions_root / session_name
+    session_dir = sessions_root / _get_session_name(scan_root)
     session_dir.mkdir(parents=True, exist_ok=True)
 
     return session_dir
@@ -82,7 +84,7 @@ def save_session(scan_result, output_dir=None, report_path=None):
     session_data = {
         "created_at": datetime.now().isoformat(),
         "scan_root": scan_result["root"],
-        "scan_data": scan_result,
+        "scan_data": {key: value for key, value in scan_result.items() if key != "tree"},
     }
 
     if report_path is not None:
@@ -125,6 +127,28 @@ def load_session(session_identifier):
     return None
 
 
+def load_previous_scan(scan_root):
+    sessions_root = get_sessions_root()
+    if sessions_root is None:
+        sessions_root = DEFAULT_SESSIONS_ROOT
+
+    session_file = sessions_root / _get_session_name(scan_root) / "session.json"
+    if not session_file.exists():
+        return None
+
+    try:
+        raw = session_file.read_text(encoding="utf-8")
+        session_data = json.loads(raw)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+    scan_data = session_data.get("scan_data")
+    if not scan_data or scan_data.get("root") != str(Path(scan_root).resolve()):
+        return None
+
+    return scan_data
+
+
 def calculate_file_hash(filepath):
     try:
         content = Path(filepath).read_bytes()
@@ -216,7 +240,7 @@ def delete_session(session_path):
 
 def find_report_files(directory):
     root = Path(directory).resolve()
-    report_extensions = {".txt", ".md", ".json", ".pdf"}
+    report_extensions = {".txt", ".md", ".json", ".jsonl", ".pdf"}
     report_files = []
 
     try:
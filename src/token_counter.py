@@ -1,19 +1,54 @@
+import math
+from pathlib import Path
+
 from rich.console import Console
 
+from src.lazy import is_lazy
+from src.utils.encoding import decode_text
+from src.utils.file_filter import (
+    SNIFF_SIZE,
+    is_binary_content,
+    is_binary_extension,
+    is_generated_file,
+)
+
 console = Console()
 
+ESTIMATE_SAMPLE_FILES = 32
+ESTIMATE_SAMPLE_PER_EXTENSION = 4
+ESTIMATE_SAMPLE_BYTES = 16 * 1024
+DEFAULT_TOKEN_DENSITY = 0.25
+CONFIDENCE_Z = 1.96
+MIN_RELATIVE_ERROR = 0.05
+
+_encoding = None
+
 
 def count_tokens(text):
+    encoding = _get_encoding()
+
+    if encoding is None:
+        return estimate_tokens(text)
+
     try:
-        import tiktoken
-        encoding = tiktoken.get_encoding("cl100k_base")
         return len(encoding.encode(text))
-    except ImportError:
-        return estimate_tokens(text)
     except Exception:
         return estimate_tokens(text)
 
 
+def _get_encoding():
+    global _encoding
+
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+
+    return _encoding or None
+
+
 def estimate_tokens(text):
     return len(text) // 4
 
@@ -28,11 +63,101 @@ def format_token_count(token_count):
 
 def get_scan_tokens(scan_result):
     total_text = ""
+    estimated = 0
 
     for file_data in scan_result["files"]:
-        total_text += file_data["content"] + "\n"
+        if is_lazy(file_data):
+            estimated += file_data.size // 4
+        else:
+            total_text += file_data["content"] + "\n"
+
+    return count_tokens(total_text) + estimated
+
+
+def estimate_inventory_tokens(inventory, max_file_size_mb=10, sample_files=ESTIMATE_SAMPLE_FILES):
+    root = Path(inventory["root"])
+    max_size = max_file_size_mb * 1024 * 1024
+    groups = {}
+
+    for record in inventory["structure"]:
+        if record["type"] != "file" or "size" not in record:
+            continue
+        if record["size"] > max_size or is_binary_extension(record["path"]):
+            continue
+        if is_generated_file(record["path"]):
+            continue
+        groups.setdefault(Path(record["path"]).suffix.lower(), []).append(record)
+
+    totals = {extension: sum(r["size"] for r in records) for extension, records in groups.items()}
+    densities = {}
+    remaining = sample_files
+
+    for extension in sorted(groups, key=lambda extension: -totals[extension]):
+        if remaining <= 0:
+            break
+
+        records = sorted(groups[extension], key=lambda record: record["size"])
+        count = min(ESTIMATE_SAMPLE_PER_EXTENSION, remaining, len(records))
+
+        for index in range(count):
+            record = records[index * len(records) // count]
+            density = _sample_density(root / record["path"])
+            if density is not None:
+                densities.setdefault(extension, []).append(density)
+                remaining -= 1
+
+    samples = [density for values in densities.values() for density in values]
+    overall = sum(samples) / len(samples) if samples else DEFAULT_TOKEN_DENSITY
+    overall_error = _standard_error(samples) if len(samples) > 1 else overall / 2
+
+    tokens = 0.0
+    variance = 0.0
+
+    for extension, size in totals.items():
+        values = densities.get(extension, [])
+        density = sum(values) / len(values) if values else overall
+        error = _standard_error(values) if len(values) > 1 else overall_error
+        error = max(error, density * MIN_RELATIVE_ERROR)
+        tokens += size * density
+        variance += (size * error) ** 2
+
+    margin = CONFIDENCE_Z * math.sqrt(variance)
+
+    return {
+        "files": sum(len(records) for records in groups.values()),
+        "bytes": sum(totals.values()),
+        "tokens": int(tokens),
+        "low": max(0, int(tokens - margin)),
+        "high": int(tokens + margin),
+        "sampled": len(samples),
+    }
+
+
+def _sample_density(filepath):
+    try:
+        with open(filepath, "rb") as f:
+            data = f.read(ESTIMATE_SAMPLE_BYTES)
+            truncated = bool(f.read(1))
+    except OSError:
+        return None
+
+    if not data:
+        return None
+
+    if is_binary_content(data[:SNIFF_SIZE]):
+        return 0.0
+
+    if truncated and b"\n" in data:
+        data = data[:data.rfind(b"\n") + 1]
+
+    text, _ = decode_text(data)
+    return count_tokens(text) / len(data)
+
 
-    return count_tokens(total_text)
+def _standard_error(values):
+    mean = sum(values) / len(values)
+    variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+    return math.sqrt(variance / len(values))
 
 
 def show_token_info(scan_result):
@@ -0,0 +1,90 @@
+from array import array
+
+from src.lazy import content_size
+
+
+def new_tree_model():
+    return {
+        "paths": [],
+        "names": [],
+        "is_dir": bytearray(),
+        "parent": array("i"),
+        "depth": array("i"),
+        "end": array("i"),
+        "size": array("q"),
+        "files": array("i"),
+        "index": {},
+    }
+
+
+def add_tree_node(model, path, is_dir, size=0):
+    if is_dir and path in model["index"]:
+        return model["index"][path]
+
+    cut = max(path.rfind("/"), path.rfind("\\"))
+    parent = -1
+
+    if cut > 0:
+        parent = model["index"].get(path[:cut])
+        if parent is None:
+            parent = add_tree_node(model, path[:cut], True)
+
+    node = len(model["paths"])
+
+    model["paths"].append(path)
+    model["names"].append(path[cut + 1:])
+    model["is_dir"].append(is_dir)
+    model["parent"].append(parent)
+    model["depth"].append(model["depth"][parent] + 1 if parent >= 0 else 0)
+    model["end"].append(node + 1)
+    model["size"].append(size)
+    model["files"].append(0 if is_dir else 1)
+
+    if is_dir:
+        model["index"][path] = node
+
+    return node
+
+
+def build_tree_model(structure, files=()):
+    sizes = {file_data["path"]: content_size(file_data) for file_data in files}
+    model = new_tree_model()
+
+    for item in structure:
+        is_dir = item["type"] == "directory"
+        size = 0 if is_dir else sizes.get(item["path"], item.get("size", 0))
+        add_tree_node(model, item["path"], is_dir, size)
+
+    parent = model["parent"]
+    end = model["end"]
+    size = model["size"]
+    count = model["files"]
+
+    for node in range(len(parent) - 1, -1, -1):
+        owner = parent[node]
+        if owner >= 0:
+            size[owner] += size[node]
+            count[owner] += count[node]
+            if end[node] > end[owner]:
+                end[owner] = end[node]
+
+    return model
+
+
+def get_tree_model(scan_result):
+    model = scan_result.get("tree")
+
+    if model is None:
+        model = build_tree_model(scan_result.get("structure", ()), scan_result.get("files", ()))
+        scan_result["tree"] = model
+
+    return model
+
+
+def iter_children(model, node=-1):
+    child = node + 1
+    stop = model["end"][node] if node >= 0 else len(model["paths"])
+
+    while child < stop:
+        yield child
+        child = model["end"][child]
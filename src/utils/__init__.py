@@ -1,3 +1,3 @@
 from src.utils.file_filter import is_binary_extension, is_within_size_limit
-from src.utils.encoding import detect_file_encoding, read_file_safe
+from src.utils.encoding import detect_file_encoding, read_file_safe, read_text_file
 from src.utils.safety import check_access
\ No newline at end of file
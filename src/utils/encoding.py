@@ -1,58 +1,148 @@
+import os
 from pathlib import Path
 
+from src.utils.file_filter import is_binary_content
 
-def detect_file_encoding(filepath, sample_size=8192):
+FALLBACK_ENCODINGS = ["utf-8", "utf-8-sig", "cp1251", "latin-1"]
+
+BINARY_ENCODING = "binary"
+
+SAMPLE_MARKER = "... [фрагмент: пропущено {omitted} байт из {size}] ..."
+
+
+def detect_encoding(raw):
     try:
-        raw = Path(filepath).read_bytes()[:sample_size]
+        raw.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
 
-        try:
-            raw.decode("utf-8")
-            return "utf-8"
-        except UnicodeDecodeError:
-            pass
+    try:
+        raw.decode("utf-8-sig")
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        pass
 
-        try:
-            raw.decode("utf-8-sig")
-            return "utf-8-sig"
-        except UnicodeDecodeError:
-            pass
+    try:
+        import chardet
+        detection = chardet.detect(raw)
+        encoding = detection.get("encoding")
+        confidence = detection.get("confidence", 0)
 
-        try:
-            import chardet
-            detection = chardet.detect(raw)
-            encoding = detection.get("encoding")
-            confidence = detection.get("confidence", 0)
+        if encoding and confidence > 0.7:
+            return encoding
+    except ImportError:
+        pass
 
-            if encoding and confidence > 0.7:
-                return encoding
-        except ImportError:
-            pass
+    return "utf-8"
 
-        return "utf-8"
 
+def detect_file_encoding(filepath, sample_size=8192):
+    try:
+        with open(filepath, "rb") as f:
+            raw = f.read(sample_size)
     except OSError:
         return "utf-8"
 
+    return detect_encoding(raw)
 
-def read_file_safe(filepath, encoding="utf-8"):
-    path = Path(filepath)
 
-    encodings_to_try = [encoding, "utf-8", "utf-8-sig", "cp1251", "latin-1"]
+def decode_bytes(data, encoding="utf-8"):
     seen = set()
 
-    for enc in encodings_to_try:
+    for enc in [encoding, *FALLBACK_ENCODINGS]:
         if enc in seen:
             continue
         seen.add(enc)
 
         try:
-            content = path.read_text(encoding=enc)
-            content.encode("utf-8")
-            return content
-        except (UnicodeDecodeError, UnicodeEncodeError, OSError):
+            return _normalize_newlines(data.decode(enc))
+        except (UnicodeDecodeError, LookupError):
             continue
 
+    return _normalize_newlines(data.decode("utf-8", errors="replace"))
+
+
+def read_file_safe(filepath, encoding="utf-8"):
     try:
-        return path.read_text(encoding="utf-8", errors="replace")
+        data = Path(filepath).read_bytes()
     except OSError:
-        return None
\ No newline at end of file
+        return None
+
+    return decode_bytes(data, encoding)
+
+
+def read_text_file(filepath, sample_size=8192, skip_binary=False, cache_key=None):
+    try:
+        with open(filepath, "rb") as f:
+            data = bytearray(os.fstat(f.fileno()).st_size)
+
+            with memoryview(data) as view:
+                filled = f.readinto(view[:sample_size])
+                if skip_binary and is_binary_content(bytes(view[:filled]), cache_key):
+                    return None, BINARY_ENCODING
+                while filled < len(data):
+                    count = f.readinto(view[filled:])
+                    if not count:
+                        break
+                    filled += count
+
+            del data[filled:]
+            data += f.read()
+    except OSError:
+        return None, "utf-8"
+
+    return decode_text(data, sample_size)
+
+
+def read_text_sample(filepath, head_size, tail_size, sample_size=8192, skip_binary=False,
+                     cache_key=None):
+    try:
+        with open(filepath, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            first = f.read(max(head_size, sample_size))
+            if skip_binary and is_binary_content(first[:sample_size], cache_key):
+                return None, BINARY_ENCODING
+            head = first[:head_size]
+            tail_start = max(head_size, size - tail_size)
+            f.seek(tail_start)
+            tail = f.read(size - tail_start)
+    except OSError:
+        return None, "utf-8"
+
+    if size - tail_size <= head_size:
+        return decode_text(head + tail, sample_size)
+
+    if b"\n" in head:
+        head = head[:head.rfind(b"\n") + 1]
+    if b"\n" in tail[:-1]:
+        tail = tail[tail.find(b"\n") + 1:]
+
+    if head:
+        head_text, encoding = decode_text(head, sample_size)
+        tail_text = decode_bytes(tail, encoding)
+    else:
+        tail_text, encoding = decode_text(tail, sample_size)
+        head_text = ""
+
+    if head_text and not head_text.endswith("\n"):
+        head_text += "\n"
+
+    marker = SAMPLE_MARKER.format(omitted=size - len(head) - len(tail), size=size)
+    return f"{head_text}{marker}\n{tail_text}", encoding
+
+
+def decode_text(data, sample_size=8192):
+    try:
+        return _normalize_newlines(data.decode("utf-8")), "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    encoding = detect_encoding(data[:sample_size])
+    return decode_bytes(data, encoding), encoding
+
+
+def _normalize_newlines(text):
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
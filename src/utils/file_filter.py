@@ -1,3 +1,6 @@
+import codecs
+import os
+import re
 from pathlib import Path
 
 BINARY_EXTENSIONS = {
@@ -13,14 +16,137 @@ BINARY_EXTENSIONS = {
     ".woff", ".woff2", ".ttf", ".eot",
 }
 
+GENERATED_FILENAMES = {
+    "package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml", "bun.lockb",
+    "poetry.lock", "Pipfile.lock", "uv.lock", "Cargo.lock", "composer.lock",
+    "Gemfile.lock", "go.sum", "flake.lock", "packages.lock.json",
+}
+
+GENERATED_SUFFIXES = (
+    ".min.js", ".min.mjs", ".min.css", ".map", ".bundle.js", ".chunk.js",
+)
+
+GENERATED_HEADER_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"^Code generated .* DO NOT EDIT\.$",
+    r"@generated\b",
+    r"\b[Gg]enerated by .*DO NOT EDIT",
+    r"^<auto-generated",
+))
+
+COMMENT_PREFIXES = ("//", "#", "/*", "*", "--", ";", "<!--", "%")
+COMMENT_SUFFIXES = ("*/", "-->")
+
+MINIFIED_EXTENSIONS = {".js", ".mjs", ".cjs", ".css", ".json", ".map"}
+
+MARKER_SCAN_SIZE = 1024
+MINIFIED_MIN_SIZE = 4096
+MINIFIED_LINE_LIMIT = 500
+MINIFIED_LONG_SHARE = 0.5
+
+SNIFF_SIZE = 8192
+CONTROL_RATIO_LIMIT = 0.1
+VERDICT_CACHE_LIMIT = 100_000
+
+TEXT_BOMS = (
+    codecs.BOM_UTF8,
+    codecs.BOM_UTF32_LE,
+    codecs.BOM_UTF32_BE,
+    codecs.BOM_UTF16_LE,
+    codecs.BOM_UTF16_BE,
+)
+
+CONTROL_BYTES = bytes(
+    [byte for byte in range(32) if byte not in (9, 10, 12, 13, 27)] + [127]
+)
+
+_binary_verdicts = {}
+
 
 def is_binary_extension(filepath):
     return Path(filepath).suffix.lower() in BINARY_EXTENSIONS
 
 
+def is_binary_content(sample, cache_key=None):
+    if cache_key is not None:
+        verdict = _binary_verdicts.get(cache_key)
+        if verdict is not None:
+            return verdict
+
+    verdict = _sniff_binary(sample)
+
+    if cache_key is not None:
+        if len(_binary_verdicts) >= VERDICT_CACHE_LIMIT:
+            _binary_verdicts.clear()
+        _binary_verdicts[cache_key] = verdict
+
+    return verdict
+
+
+def is_generated_file(filepath):
+    name = Path(filepath).name
+    return name in GENERATED_FILENAMES or name.lower().endswith(GENERATED_SUFFIXES)
+
+
+def is_generated_content(sample, filepath=None):
+    for line in _header_comments(sample[:MARKER_SCAN_SIZE]):
+        if any(pattern.search(line) for pattern in GENERATED_HEADER_PATTERNS):
+            return True
+
+    if filepath is None or Path(filepath).suffix.lower() not in MINIFIED_EXTENSIONS:
+        return False
+
+    if len(sample) < MINIFIED_MIN_SIZE:
+        return False
+
+    long_chars = sum(len(line) for line in sample.split("\n") if len(line) > MINIFIED_LINE_LIMIT)
+    return long_chars > len(sample) * MINIFIED_LONG_SHARE
+
+
+def _header_comments(head):
+    for line in head.split("\n"):
+        line = line.strip()
+
+        if not line or line.startswith("#!"):
+            continue
+
+        prefix = next((prefix for prefix in COMMENT_PREFIXES if line.startswith(prefix)), None)
+        if prefix is None:
+            return
+
+        line = line[len(prefix):]
+        for suffix in COMMENT_SUFFIXES:
+            if line.endswith(suffix):
+                line = line[:-len(suffix)]
+
+        yield line.strip()
+
+
+def cached_binary_verdict(cache_key):
+    if cache_key is None:
+        return None
+    return _binary_verdicts.get(cache_key)
+
+
+def _sniff_binary(sample):
+    if not sample or sample.startswith(TEXT_BOMS):
+        return False
+
+    if b"\0" in sample:
+        return True
+
+    controls = len(sample) - len(sample.translate(None, CONTROL_BYTES))
+    return controls / len(sample) > CONTROL_RATIO_LIMIT
+
+
+def get_file_size(filepath):
+    if isinstance(filepath, os.DirEntry):
+        return filepath.stat().st_size
+    return Path(filepath).stat().st_size
+
+
 def is_within_size_limit(filepath, max_size_mb=10):
     try:
-        size_mb = Path(filepath).stat().st_size / (1024 * 1024)
+        size_mb = get_file_size(filepath) / (1024 * 1024)
         return size_mb <= max_size_mb
     except OSError:
         return False
\ No newline at end of file
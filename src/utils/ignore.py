@@ -0,0 +1,265 @@
+import os
+import re
+from pathlib import Path
+
+IGNORE_FILES = (".gitignore", ".ignore")
+
+
+def _translate_glob(pattern):
+    result = []
+    i = 0
+    n = len(pattern)
+
+    while i < n:
+        char = pattern[i]
+
+        if char == "*":
+            if pattern.startswith("**", i):
+                i += 2
+                if i < n and pattern[i] == "/":
+                    result.append("(?:.*/)?")
+                    i += 1
+                else:
+                    result.append(".*")
+                continue
+            result.append("[^/]*")
+
+        elif char == "?":
+            result.append("[^/]")
+
+        elif char == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            j = pattern.find("]", j)
+
+            if j < 0:
+                result.append("\\[")
+            else:
+                body = pattern[i + 1:j].replace("\\", "\\\\")
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                result.append(f"[{body}]")
+                i = j
+
+        elif char == "\\" and i + 1 < n:
+            i += 1
+            result.append(re.escape(pattern[i]))
+
+        else:
+            result.append(re.escape(char))
+
+        i += 1
+
+    return "".join(result)
+
+
+def parse_rule(line):
+    line = line.rstrip("\r\n")
+
+    if not line or line.startswith("#"):
+        return None
+
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith(("\\!", "\\#")):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+
+    if not line:
+        return None
+
+    anchored = "/" in line
+    regex = _translate_glob(line.lstrip("/"))
+
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+
+    return regex, negate, dir_only
+
+
+def _combine(rules):
+    if not rules:
+        return None, ()
+
+    ordered = list(reversed(rules))
+    pattern = re.compile("|".join(f"({regex})" for regex, _, _ in ordered))
+    negations = tuple(negate for _, negate, _ in ordered)
+
+    return pattern, negations
+
+
+class IgnoreRules:
+    def __init__(self, rules):
+        self.dir_pattern, self.dir_negations = _combine(rules)
+        self.file_pattern, self.file_negations = _combine(
+            [rule for rule in rules if not rule[2]]
+        )
+
+    @classmethod
+    def from_lines(cls, lines):
+        rules = [rule for rule in map(parse_rule, lines) if rule is not None]
+        return cls(rules) if rules else None
+
+    def match(self, path, is_dir):
+        if is_dir:
+            pattern, negations = self.dir_pattern, self.dir_negations
+        else:
+            pattern, negations = self.file_pattern, self.file_negations
+
+        if pattern is None:
+            return None
+
+        found = pattern.fullmatch(path)
+        if found is None:
+            return None
+
+        return not negations[found.lastindex - 1]
+
+
+def compile_globs(patterns):
+    compiled = []
+
+    for pattern in patterns:
+        rule = parse_rule(pattern)
+        if rule is not None:
+            compiled.append(re.compile(rule[0]))
+
+    return compiled
+
+
+def match_glob_index(compiled, path):
+    path = path.replace(os.sep, "/")
+    candidates = [path]
+
+    while "/" in path:
+        path = path.rsplit("/", 1)[0]
+        candidates.append(path)
+
+    for index, pattern in enumerate(compiled):
+        if any(pattern.fullmatch(candidate) for candidate in candidates):
+            return index
+
+    return len(compiled)
+
+
+class _Scope:
+    def __init__(self, rules, strip, add, parent):
+        self.rules = rules
+        self.strip = strip
+        self.add = add
+        self.parent = parent
+
+
+class IgnoreMatcher:
+    def __init__(self, root, exclude=(), include=(), use_gitignore=True):
+        self.root = Path(root)
+        self.use_gitignore = use_gitignore
+        self.exclude = IgnoreRules.from_lines(exclude)
+        self.include = IgnoreRules.from_lines(include)
+        self.root_scope = self._ancestor_scope() if use_gitignore else None
+
+    def enter(self, scope, directory, relative, names):
+        if not self.use_gitignore:
+            return scope
+
+        lines = []
+        for name in IGNORE_FILES:
+            if name in names:
+                lines.extend(_read_lines(Path(directory) / name))
+
+        rules = IgnoreRules.from_lines(lines)
+        if rules is None:
+            return scope
+
+        strip = relative.replace(os.sep, "/") + "/" if relative else ""
+        return _Scope(rules, strip, "", scope)
+
+    def scope_for(self, relative):
+        scope = self.enter(self.root_scope, self.root, "", _present_ignore_files(self.root))
+
+        if not relative:
+            return scope
+
+        current = ""
+        for part in relative.split(os.sep):
+            current = os.path.join(current, part) if current else part
+            directory = self.root / current
+            scope = self.enter(scope, directory, current, _present_ignore_files(directory))
+
+        return scope
+
+    def is_ignored(self, scope, relative, is_dir):
+        path = relative.replace(os.sep, "/")
+
+        verdict = self.exclude.match(path, is_dir) if self.exclude is not None else None
+
+        while verdict is None and scope is not None:
+            verdict = scope.rules.match(scope.add + path[len(scope.strip):], is_dir)
+            scope = scope.parent
+
+        if verdict:
+            return True
+
+        if self.include is not None and not is_dir:
+            return not self.include.match(path, False)
+
+        return False
+
+    def _ancestor_scope(self):
+        ancestors = []
+
+        for directory in self.root.parents:
+            ancestors.append(directory)
+            if (directory / ".git").exists():
+                break
+        else:
+            ancestors = []
+
+        if (self.root / ".git").exists():
+            ancestors = []
+
+        top = ancestors[-1] if ancestors else self.root
+        scope = None
+
+        exclude_file = top / ".git" / "info" / "exclude"
+        rules = IgnoreRules.from_lines(_read_lines(exclude_file))
+        if rules is not None:
+            scope = _Scope(rules, "", _prefix(self.root, top), scope)
+
+        for directory in reversed(ancestors):
+            lines = []
+            for name in IGNORE_FILES:
+                lines.extend(_read_lines(directory / name))
+
+            rules = IgnoreRules.from_lines(lines)
+            if rules is not None:
+                scope = _Scope(rules, "", _prefix(self.root, directory), scope)
+
+        return scope
+
+
+def _prefix(root, directory):
+    relative = root.relative_to(directory).as_posix()
+    return "" if relative == "." else relative + "/"
+
+
+def _present_ignore_files(directory):
+    return [name for name in IGNORE_FILES if (Path(directory) / name).is_file()]
+
+
+def _read_lines(path):
+    try:
+        return path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return []
@@ -0,0 +1,184 @@
+import os
+
+FOLLOW_SYMLINKS = ("always", "inside", "never")
+
+
+def is_dir_entry(entry):
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def is_file_entry(entry):
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+def list_entries(directory, dirs_first=True):
+    with os.scandir(directory) as iterator:
+        entries = list(iterator)
+
+    if dirs_first:
+        entries.sort(key=lambda e: (is_file_entry(e), e.name.lower()))
+    else:
+        entries.sort(key=lambda e: e.name.lower())
+
+    return entries
+
+
+def join_relative(parent, name):
+    if not parent:
+        return name
+    return f"{parent}{os.sep}{name}"
+
+
+def walk(root, skip_directories=(), dirs_first=True, matcher=None, limits=None):
+    state = _WalkState(root, skip_directories, dirs_first, matcher, limits)
+    state.mark_visited(state.root)
+
+    scope = matcher.root_scope if matcher is not None else None
+    children = state.list_children(state.root, "", scope)
+
+    if isinstance(children, tuple):
+        yield children
+    else:
+        yield from state.run(children)
+
+
+def walk_entry(entry, relative, skip_directories=(), dirs_first=True, matcher=None,
+               scope=None, limits=None, root=None):
+    if root is None:
+        root = entry.path[:len(entry.path) - len(relative)].rstrip(os.sep) or os.sep
+
+    state = _WalkState(root, skip_directories, dirs_first, matcher, limits)
+    state.mark_visited(state.root)
+
+    parent = os.path.dirname(relative)
+    while parent:
+        state.mark_visited(os.path.join(state.root, parent))
+        parent = os.path.dirname(parent)
+
+    yield from state.run(iter([(entry, relative, scope)]))
+
+
+def find_entry(directory, name):
+    try:
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                if entry.name == name:
+                    return entry
+    except OSError:
+        pass
+
+    return None
+
+
+class _WalkState:
+    def __init__(self, root, skip_directories, dirs_first, matcher, limits):
+        limits = limits or {}
+
+        self.root = str(root)
+        self.skip_directories = skip_directories
+        self.dirs_first = dirs_first
+        self.matcher = matcher
+        self.max_depth = limits.get("max_depth") or None
+        self.max_files = limits.get("max_files") or None
+        self.follow_symlinks = limits.get("follow_symlinks") or "always"
+        self.visited = set()
+        self.files = 0
+        self.real_root = None
+
+    def mark_visited(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self.visited.add((stat.st_dev, stat.st_ino))
+
+    def run(self, entries):
+        stack = [entries]
+
+        while stack:
+            item = next(stack[-1], None)
+
+            if item is None:
+                stack.pop()
+                continue
+
+            entry, relative, scope = item
+
+            if is_dir_entry(entry):
+                kind = self._directory_kind(entry, relative, scope)
+                yield kind, relative, entry
+
+                if kind != "directory":
+                    continue
+
+                children = self.list_children(entry.path, relative, scope)
+                if isinstance(children, tuple):
+                    yield children
+                else:
+                    stack.append(children)
+
+            elif is_file_entry(entry):
+                if self.matcher is not None and self.matcher.is_ignored(scope, relative, False):
+                    continue
+
+                if self.max_files is not None and self.files >= self.max_files:
+                    yield "limit", os.path.dirname(relative) or ".", None
+                    return
+
+                self.files += 1
+                yield "file", relative, entry
+
+    def list_children(self, directory, relative, scope):
+        try:
+            entries = list_entries(directory, self.dirs_first)
+        except OSError:
+            return "error", relative or ".", None
+
+        if self.matcher is not None:
+            scope = self.matcher.enter(scope, directory, relative, [entry.name for entry in entries])
+
+        return ((entry, join_relative(relative, entry.name), scope) for entry in entries)
+
+    def _directory_kind(self, entry, relative, scope):
+        if entry.name in self.skip_directories:
+            return "excluded"
+
+        if self.matcher is not None and self.matcher.is_ignored(scope, relative, True):
+            return "ignored"
+
+        if self.max_depth is not None and relative.count(os.sep) + 1 >= self.max_depth:
+            return "depth"
+
+        try:
+            stat = entry.stat()
+            symlink = entry.is_symlink()
+        except OSError:
+            return "error"
+
+        key = (stat.st_dev, stat.st_ino)
+
+        if symlink:
+            if self.follow_symlinks == "never":
+                return "symlink"
+
+            if key in self.visited:
+                return "visited"
+
+            if self.follow_symlinks == "inside" and not self._is_inside_root(entry.path):
+                return "outside"
+
+        self.visited.add(key)
+        return "directory"
+
+    def _is_inside_root(self, path):
+        if self.real_root is None:
+            self.real_root = os.path.realpath(self.root)
+
+        target = os.path.realpath(path)
+        return target == self.real_root or target.startswith(self.real_root + os.sep)
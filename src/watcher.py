@@ -0,0 +1,217 @@
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+
+from src.scanner import SKIP_DIRECTORIES, rescan_paths
+from src.walker import join_relative, walk
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+
+EVENT_HEADER = struct.Struct("iIII")
+
+ROOT_CHANGED = ""
+
+
+class InotifyWatcher:
+    def __init__(self, root):
+        self.root = str(root)
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+
+        if self.fd < 0:
+            error_code = ctypes.get_errno()
+            raise OSError(error_code, os.strerror(error_code))
+
+        self.watches = {}
+
+        try:
+            self._add_tree("")
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            self._parse_events(data, changed)
+
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def _parse_events(self, data, changed):
+        offset = 0
+
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.add(ROOT_CHANGED)
+                continue
+
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+
+            if mask & IN_IGNORED:
+                del self.watches[wd]
+                continue
+
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                changed.add(directory)
+                continue
+
+            relative = join_relative(directory, name) if name else directory
+            changed.add(relative)
+
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                if name not in SKIP_DIRECTORIES:
+                    self._add_tree(relative)
+
+    def _add_tree(self, relative):
+        self._add_watch(relative)
+
+        directory = os.path.join(self.root, relative)
+        for kind, child, _ in walk(directory, SKIP_DIRECTORIES):
+            if kind == "directory":
+                self._add_watch(join_relative(relative, child))
+
+    def _add_watch(self, relative):
+        path = os.path.join(self.root, relative)
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+
+        if wd < 0:
+            error_code = ctypes.get_errno()
+            if error_code == errno.ENOSPC:
+                raise OSError(error_code, os.strerror(error_code))
+            return
+
+        self.watches[wd] = relative
+
+
+class PollingWatcher:
+    def __init__(self, root, interval=1.0):
+        self.root = str(root)
+        self.interval = interval
+        self.next_poll = time.monotonic() + interval
+        self.snapshot = self._take_snapshot()
+
+    def wait(self, timeout):
+        delay = min(timeout, max(0.0, self.next_poll - time.monotonic()))
+        time.sleep(delay)
+
+        if time.monotonic() < self.next_poll:
+            return set()
+
+        self.next_poll = time.monotonic() + self.interval
+        snapshot = self._take_snapshot()
+
+        changed = {
+            relative
+            for relative in snapshot.keys() | self.snapshot.keys()
+            if snapshot.get(relative) != self.snapshot.get(relative)
+        }
+
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        self.snapshot = {}
+
+    def _take_snapshot(self):
+        snapshot = {}
+
+        for kind, relative, entry in walk(self.root, SKIP_DIRECTORIES):
+            if kind != "file":
+                snapshot[relative] = (kind,)
+                continue
+
+            try:
+                stat = entry.stat()
+                snapshot[relative] = (kind, stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                snapshot[relative] = (kind,)
+
+        return snapshot
+
+
+def create_watcher(root, poll_interval=1.0):
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+
+    return PollingWatcher(root, poll_interval)
+
+
+def watch_scan(scan_result, on_update, max_file_size_mb=10, debounce=0.3,
+               stop_event=None, ignore_patterns=(), poll_interval=1.0, filters=None,
+               lazy=False, limits=None, budget=None):
+    watcher = create_watcher(scan_result["root"], poll_interval)
+    pending = set()
+    last_change = 0.0
+
+    try:
+        while stop_event is None or not stop_event.is_set():
+            changes = {
+                relative
+                for relative in watcher.wait(debounce if pending else 0.5)
+                if not any(fnmatch.fnmatch(relative, pattern) for pattern in ignore_patterns)
+            }
+
+            if changes:
+                pending |= changes
+                last_change = time.monotonic()
+                continue
+
+            if pending and time.monotonic() - last_change >= debounce:
+                changed, pending = pending, set()
+                rescan_paths(
+                    scan_result, changed, max_file_size_mb, filters, lazy, limits, budget
+                )
+                on_update(scan_result, changed)
+    finally:
+        watcher.close()